@@ -3,11 +3,128 @@ Blood Alcohol Content (BAC) Calculator
 Real-time BAC monitoring system for wearable devices
 """
 
+import bisect
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+from types import MappingProxyType
 import math
 
+# Unit conversions
+_LBS_TO_G = 453.592        # grams per pound
+_OZ_TO_ML = 29.5735        # milliliters per fluid ounce
+_ETHANOL_DENSITY = 0.789   # grams per milliliter
+# grams of alcohol per (oz x alcohol percent)
+_OZ_ALCPCT_TO_G = _OZ_TO_ML * _ETHANOL_DENSITY / 100.0
+
+# Upper bounds (exclusive) of each BAC level below the most severe one
+_BAC_THRESHOLDS = (0.02, 0.05, 0.08, 0.15)
+
+# Effects and recommendations for each BAC level, indexed by bisecting _BAC_THRESHOLDS
+_BAC_EFFECTS = (
+    MappingProxyType({
+        'level': 'Sober',
+        'effects': 'No significant effects',
+        'recommendation': 'Safe to drive',
+        'color': 'green'
+    }),
+    MappingProxyType({
+        'level': 'Mild Impairment',
+        'effects': 'Slight euphoria, relaxation, decreased inhibition',
+        'recommendation': 'Exercise caution',
+        'color': 'yellow'
+    }),
+    MappingProxyType({
+        'level': 'Moderate Impairment',
+        'effects': 'Impaired judgment, reduced coordination, slower reaction time',
+        'recommendation': 'Do not drive',
+        'color': 'orange'
+    }),
+    MappingProxyType({
+        'level': 'High Impairment',
+        'effects': 'Significant impairment, poor coordination, slurred speech',
+        'recommendation': 'Do not drive, seek safe transportation',
+        'color': 'red'
+    }),
+    MappingProxyType({
+        'level': 'Severe Impairment',
+        'effects': 'Severe impairment, risk of alcohol poisoning',
+        'recommendation': 'Seek medical attention if needed',
+        'color': 'darkred'
+    })
+)
+
+
+def _bac_level_index(bac):
+    """Index of the BAC level (0 = sober ... 4 = severe) that a BAC falls in"""
+    return bisect.bisect_right(_BAC_THRESHOLDS, bac)
+
+
+def _widmark_kernel(total_alcohol_grams, weight_lbs, widmark_factor, metabolism_rate, hours_since_first_drink):
+    """
+    Widmark BAC for a known amount of alcohol
+    Pure scalar math on primitive floats, shared by every calculation path
+    """
+    # Convert weight to grams
+    weight_grams = weight_lbs * _LBS_TO_G
+    
+    return _widmark_bac(total_alcohol_grams, widmark_factor * weight_grams, metabolism_rate, hours_since_first_drink)
+
+
+def _widmark_bac(total_alcohol_grams, r_weight_grams, metabolism_rate, hours_since_first_drink):
+    """
+    _widmark_kernel with the Widmark factor x body weight (grams) already
+    multiplied out, for callers whose profile is fixed between calls
+    """
+    # Calculate peak BAC (without metabolism)
+    # The Widmark formula gives BAC as a decimal, but we need to convert to standard format
+    # Standard BAC is typically expressed as 0.08 (8%) rather than 0.0008
+    peak_bac = (total_alcohol_grams / r_weight_grams) * 100
+    
+    # Apply metabolism over time
+    # Note: Peak BAC typically occurs 30-60 minutes after consumption
+    # For simplicity, we'll assume peak at 30 minutes and apply metabolism from there
+    # Rising linearly to peak within 30 minutes, then eliminated at a constant rate;
+    # min/max select the active phase without branching
+    bac = (peak_bac * min(hours_since_first_drink * 2.0, 1.0)
+           - metabolism_rate * max(hours_since_first_drink - 0.5, 0.0))
+    
+    # Ensure BAC doesn't go below 0
+    return max(0.0, bac)
+
+
+def _widmark_curve(total_alcohol_grams, weight_lbs, widmark_factor, metabolism_rate, hours_since_first_drink):
+    """
+    _widmark_kernel evaluated elementwise over an array of hours
+    """
+    return _widmark_bac_curve(total_alcohol_grams, widmark_factor * (weight_lbs * _LBS_TO_G), metabolism_rate,
+                              hours_since_first_drink)
+
+
+def _widmark_bac_curve(total_alcohol_grams, r_weight_grams, metabolism_rate, hours_since_first_drink):
+    """
+    _widmark_bac evaluated elementwise over an array of hours
+    """
+    t = np.asarray(hours_since_first_drink, dtype=np.float64)
+    peak_bac = (total_alcohol_grams / r_weight_grams) * 100
+    bac = peak_bac * np.minimum(t * 2.0, 1.0) - metabolism_rate * np.maximum(t - 0.5, 0.0)
+    return np.maximum(bac, 0.0)
+
+
+def _decay(x):
+    """
+    exp(x) for the small negative exponents of the sensor time decay
+    A cubic Taylor series covers the first ~24 hours at the average
+    metabolism rate (relative error < 1e-5 for 8 hours, < 1e-3 at 24)
+    """
+    if x < -0.36:
+        return math.exp(x)
+    return 1.0 + x * (1.0 + x * 0.5 * (1.0 + x * (1.0 / 3.0)))
+
+
 class BACCalculator:
+    __slots__ = ('male_widmark_factor', 'female_widmark_factor', 'metabolism_rate', 'drink_database',
+                 '_drink_entries', '_sensor_thr', '_sensor_w', '_r')
+    
     def __init__(self):
         # Widmark factors (average values)
         self.male_widmark_factor = 0.68
@@ -23,6 +140,24 @@ class BACCalculator:
             'liquor': {'alcohol_percent': 40.0, 'volume_oz': 1.5},
             'cocktail': {'alcohol_percent': 15.0, 'volume_oz': 8.0}
         }
+        
+        # Read-only drink entries with alcohol content resolved, built from
+        # drink_database by _drink_entry as each type is first poured
+        self._drink_entries = {}
+        
+        # Sensor deviation thresholds and weights (heart rate, skin conductance, temperature)
+        self._sensor_thr = np.array([0.1, 0.15, 0.02])
+        self._sensor_w = np.array([0.02, 0.015, 0.01])
+        
+        # Widmark factor resolved once by set_gender (anything but male uses the female factor)
+        self._r = self.female_widmark_factor
+    
+    def set_gender(self, gender):
+        """
+        Resolve the Widmark factor for a gender once, so per-tick
+        calculations can pass gender=None and skip the string handling
+        """
+        self._r = self.male_widmark_factor if gender.strip().lower() == 'male' else self.female_widmark_factor
     
     def calculate_bac_widmark(self, weight_lbs, gender, drinks, hours_since_first_drink):
         """
@@ -35,43 +170,64 @@ class BACCalculator:
         W = body weight (grams)
         β = alcohol elimination rate (0.015 per hour)
         t = time since first drink (hours)
+        
+        Pass gender=None to use the factor resolved by set_gender
         """
-        # Convert weight to grams
-        weight_grams = weight_lbs * 453.592
-        
-        # Calculate total alcohol consumed (in grams)
-        total_alcohol_grams = 0
-        for drink in drinks:
-            # Convert ounces to milliliters, then calculate alcohol content
-            # 1 oz = 29.5735 ml
-            # Alcohol density = 0.789 g/ml
-            volume_ml = drink['volume_oz'] * 29.5735
-            alcohol_ml = volume_ml * (drink['alcohol_percent'] / 100)
-            alcohol_grams = alcohol_ml * 0.789
-            total_alcohol_grams += alcohol_grams
-        
-        # Get appropriate Widmark factor
-        widmark_factor = self.male_widmark_factor if gender.lower() == 'male' else self.female_widmark_factor
-        
-        # Calculate peak BAC (without metabolism)
-        # The Widmark formula gives BAC as a decimal, but we need to convert to standard format
-        # Standard BAC is typically expressed as 0.08 (8%) rather than 0.0008
-        peak_bac = (total_alcohol_grams / (widmark_factor * weight_grams)) * 100
-        
-        # Apply metabolism over time
-        # Note: Peak BAC typically occurs 30-60 minutes after consumption
-        # For simplicity, we'll assume peak at 30 minutes and apply metabolism from there
-        if hours_since_first_drink <= 0.5:  # Within 30 minutes
-            # Still rising to peak
-            bac = peak_bac * (hours_since_first_drink / 0.5)
-        else:
-            # Past peak, apply metabolism
-            time_since_peak = hours_since_first_drink - 0.5
-            bac = peak_bac - (self.metabolism_rate * time_since_peak)
+        return self.calculate_bac_widmark_total(weight_lbs, gender, self._drinks_alcohol_grams(drinks),
+                                                hours_since_first_drink)
+
+    def calculate_bac_widmark_total(self, weight_lbs, gender, total_alcohol_grams, hours_since_first_drink):
+        """
+        Calculate BAC using the Widmark formula from an already-summed
+        amount of alcohol (grams), skipping the per-drink aggregation
         
-        # Ensure BAC doesn't go below 0
-        return max(0, bac)
-    
+        Pass gender=None to use the factor resolved by set_gender
+        """
+        return _widmark_kernel(total_alcohol_grams, weight_lbs, self._widmark_factor(gender),
+                               self.metabolism_rate, hours_since_first_drink)
+
+    def calculate_bac_curve(self, weight_lbs, gender, drinks, hours_since_first_drink):
+        """
+        Calculate BAC with the Widmark formula at many points in time at once
+        hours_since_first_drink is an array; returns an array of the same shape
+        
+        Pass gender=None to use the factor resolved by set_gender
+        """
+        return _widmark_curve(self._drinks_alcohol_grams(drinks), weight_lbs, self._widmark_factor(gender),
+                              self.metabolism_rate, hours_since_first_drink)
+
+    def _widmark_factor(self, gender):
+        """Widmark factor for a gender, or the one resolved by set_gender if gender is None"""
+        if gender is None:
+            return self._r
+        return self.male_widmark_factor if gender.lower() == 'male' else self.female_widmark_factor
+
+    def _drinks_alcohol_grams(self, drinks):
+        """Total grams of alcohol in a list of drink dicts"""
+        count = len(drinks)
+        
+        # One or two drinks (the common case): plain arithmetic beats building arrays
+        if count == 1:
+            drink = drinks[0]
+            return drink['volume_oz'] * drink['alcohol_percent'] * _OZ_ALCPCT_TO_G
+        if count == 2:
+            first, second = drinks
+            return (first['volume_oz'] * first['alcohol_percent']
+                    + second['volume_oz'] * second['alcohol_percent']) * _OZ_ALCPCT_TO_G
+        
+        volume_oz = np.fromiter((drink['volume_oz'] for drink in drinks), dtype=np.float64, count=count)
+        alcohol_percent = np.fromiter((drink['alcohol_percent'] for drink in drinks), dtype=np.float64, count=count)
+        return self.total_alcohol_grams(volume_oz, alcohol_percent)
+
+    def total_alcohol_grams(self, volume_oz, alcohol_percent):
+        """
+        Total grams of alcohol in a set of drinks
+        Takes parallel arrays of volumes (oz) and alcohol percentages
+        """
+        # Ounces to milliliters, percent to fraction and ethanol density are
+        # folded into one constant so the whole sum is a single dot product
+        return float(np.dot(volume_oz, alcohol_percent)) * _OZ_ALCPCT_TO_G
+
     def estimate_bac_from_sensors(self, heart_rate, skin_conductance, temperature, 
                                 baseline_hr, baseline_sc, baseline_temp, 
                                 last_drink_time, weight_lbs, gender):
@@ -83,67 +239,44 @@ class BACCalculator:
         hours_since_drink = (current_time - last_drink_time).total_seconds() / 3600
         
         # Calculate deviations from baseline
-        hr_deviation = (heart_rate - baseline_hr) / baseline_hr
-        sc_deviation = (skin_conductance - baseline_sc) / baseline_sc
-        temp_deviation = (temperature - baseline_temp) / baseline_temp
-        
-        # Simplified BAC estimation based on sensor deviations
-        # This is a placeholder algorithm - real systems would use machine learning
-        estimated_bac = 0
-        
-        if hr_deviation > 0.1:  # Heart rate increased by more than 10%
-            estimated_bac += 0.02 * hr_deviation
-        
-        if sc_deviation > 0.15:  # Skin conductance increased
-            estimated_bac += 0.015 * sc_deviation
+        deviations = np.array([
+            (heart_rate - baseline_hr) / baseline_hr,
+            (skin_conductance - baseline_sc) / baseline_sc,
+            (temperature - baseline_temp) / baseline_temp
+        ])
         
-        if temp_deviation > 0.02:  # Temperature increased
-            estimated_bac += 0.01 * temp_deviation
+        return self.estimate_bac_from_deviations(deviations, hours_since_drink)
+    
+    def estimate_bac_from_deviations(self, deviations, hours_since_drink):
+        """
+        Estimate BAC from relative sensor deviations (e.g. 0.1 = 10% above baseline)
+        and the hours elapsed since the last drink
+        deviations is an array of (heart_rate, skin_conductance, temperature)
+        """
+        estimated_bac = float(self.sensor_score(deviations))
         
         # Apply time decay
-        estimated_bac *= math.exp(-self.metabolism_rate * hours_since_drink)
+        estimated_bac *= _decay(-self.metabolism_rate * hours_since_drink)
         
         return max(0, estimated_bac)
     
+    def sensor_score(self, deviations):
+        """
+        Undecayed sensor BAC estimate for an array of deviations (see
+        estimate_bac_from_deviations); a 2-D array of rows gives one per row
+        """
+        # Simplified BAC estimation based on sensor deviations
+        # This is a placeholder algorithm - real systems would use machine learning
+        # Each sensor contributes weight * deviation once it is past its threshold
+        # (heart rate +10%, skin conductance +15%, temperature +2%)
+        return np.dot(np.where(deviations > self._sensor_thr, deviations, 0.0), self._sensor_w)
+    
     def get_bac_effects(self, bac):
         """
         Return effects and recommendations based on BAC level
+        The returned mapping is shared and read-only
         """
-        if bac < 0.02:
-            return {
-                'level': 'Sober',
-                'effects': 'No significant effects',
-                'recommendation': 'Safe to drive',
-                'color': 'green'
-            }
-        elif bac < 0.05:
-            return {
-                'level': 'Mild Impairment',
-                'effects': 'Slight euphoria, relaxation, decreased inhibition',
-                'recommendation': 'Exercise caution',
-                'color': 'yellow'
-            }
-        elif bac < 0.08:
-            return {
-                'level': 'Moderate Impairment',
-                'effects': 'Impaired judgment, reduced coordination, slower reaction time',
-                'recommendation': 'Do not drive',
-                'color': 'orange'
-            }
-        elif bac < 0.15:
-            return {
-                'level': 'High Impairment',
-                'effects': 'Significant impairment, poor coordination, slurred speech',
-                'recommendation': 'Do not drive, seek safe transportation',
-                'color': 'red'
-            }
-        else:
-            return {
-                'level': 'Severe Impairment',
-                'effects': 'Severe impairment, risk of alcohol poisoning',
-                'recommendation': 'Seek medical attention if needed',
-                'color': 'darkred'
-            }
+        return _BAC_EFFECTS[_bac_level_index(bac)]
     
     def calculate_sober_time(self, current_bac):
         """
@@ -158,17 +291,42 @@ class BACCalculator:
     def add_drink(self, drink_type, volume_oz=None, alcohol_percent=None):
         """
         Add a drink to the tracking system
+        Standard drinks without overrides return a shared read-only mapping;
+        copy it before modifying
         """
-        if drink_type in self.drink_database:
-            drink_info = self.drink_database[drink_type].copy()
+        base = self._drink_entry(drink_type)
+        if base is None:
+            # Custom drink
+            drink_info = {
+                'alcohol_percent': alcohol_percent or 5.0,
+                'volume_oz': volume_oz or 12.0
+            }
+        elif not volume_oz and not alcohol_percent:
+            # Standard drink as-is: share the prebuilt read-only entry
+            return base
+        else:
+            drink_info = dict(base)
             if volume_oz:
                 drink_info['volume_oz'] = volume_oz
             if alcohol_percent:
                 drink_info['alcohol_percent'] = alcohol_percent
-            return drink_info
-        else:
-            # Custom drink
-            return {
-                'alcohol_percent': alcohol_percent or 5.0,
-                'volume_oz': volume_oz or 12.0
-            } 
\ No newline at end of file
+        
+        # Alcohol content never changes once the drink is poured, so resolve it here
+        drink_info['alcohol_grams'] = self.total_alcohol_grams(drink_info['volume_oz'], drink_info['alcohol_percent'])
+        return drink_info
+    
+    def _drink_entry(self, drink_type):
+        """
+        Read-only entry for a drink_database type, or None if it isn't there
+        Rebuilt whenever the database entry was added or changed since it was cached
+        """
+        info = self.drink_database.get(drink_type)
+        if info is None:
+            return None
+        
+        entry = self._drink_entries.get(drink_type)
+        if (entry is None or entry['volume_oz'] != info['volume_oz'] or
+                entry['alcohol_percent'] != info['alcohol_percent']):
+            entry = MappingProxyType(dict(info, alcohol_grams=self.total_alcohol_grams(info['volume_oz'], info['alcohol_percent'])))
+            self._drink_entries[drink_type] = entry
+        return entry
\ No newline at end of file
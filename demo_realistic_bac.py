@@ -2,9 +2,10 @@
 Demonstration of realistic BAC calculations
 """
 
+import logging
 import time
-from datetime import datetime
-from real_time_monitor import RealTimeBACMonitor
+from datetime import datetime, timedelta
+from real_time_monitor import RealTimeBACMonitor, configure_logging
 from visualization import BACVisualizer
 
 def demo_realistic_bac():
@@ -30,6 +31,8 @@ def demo_realistic_bac():
     print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Adding 1 beer...")
     monitor.add_drink('beer')
     time.sleep(2)
+    for alert in monitor.drain_alerts():
+        print(alert)
     
     status = monitor.get_current_status()
     print(f"  BAC: {status['bac']:.3f} (immediate)")
@@ -40,7 +43,6 @@ def demo_realistic_bac():
     print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Simulating 30 minutes elapsed...")
     # Manually update the first drink time to simulate time passing
     if monitor.first_drink_time:
-        from datetime import timedelta
         monitor.first_drink_time = monitor.first_drink_time - timedelta(minutes=30)
         monitor._update_bac()
     
@@ -53,6 +55,8 @@ def demo_realistic_bac():
     print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Adding 1 shot...")
     monitor.add_drink('liquor')
     time.sleep(2)
+    for alert in monitor.drain_alerts():
+        print(alert)
     
     status = monitor.get_current_status()
     print(f"  BAC: {status['bac']:.3f} (immediate)")
@@ -76,6 +80,8 @@ def demo_realistic_bac():
     print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Adding another beer...")
     monitor.add_drink('beer')
     time.sleep(2)
+    for alert in monitor.drain_alerts():
+        print(alert)
     
     status = monitor.get_current_status()
     print(f"  BAC: {status['bac']:.3f}")
@@ -128,4 +134,6 @@ def demo_realistic_bac():
     print(f"\nMonitoring stopped.")
 
 if __name__ == "__main__":
+    # Alerts are printed from drain_alerts; only show monitoring loop errors
+    configure_logging(logging.ERROR)
     demo_realistic_bac() 
\ No newline at end of file
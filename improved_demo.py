@@ -3,12 +3,14 @@ Improved Interactive BAC Demo
 Shows realistic BAC progression and explains alcohol absorption
 """
 
-import time
+import logging
 import threading
 from datetime import datetime, timedelta
-from real_time_monitor import RealTimeBACMonitor
+from real_time_monitor import RealTimeBACMonitor, configure_logging
 from visualization import BACVisualizer
 
+_VALID_DRINKS = frozenset(('beer', 'wine', 'liquor', 'cocktail'))
+
 def improved_demo():
     """Run an improved demonstration of the BAC monitoring system"""
     print("🍺 Improved BAC Monitoring System Demo")
@@ -43,10 +45,10 @@ def improved_demo():
     
     # Background thread to show BAC progression (less frequent)
     def show_bac_progression():
-        """Show BAC progression over time"""
+        """Show BAC progression when drinks are added, or once a minute"""
         while monitor.is_monitoring:
-            time.sleep(30)  # Update every 30 seconds (less frequent)
-            if monitor.drinks:
+            monitor.wait_for_change(timeout=60)
+            if monitor.is_monitoring and monitor.drinks:
                 status = monitor.get_current_status()
                 if status['bac'] > 0.001:  # Only show if BAC is detectable
                     print(f"\n[Auto-update] BAC: {status['bac']:.3f} - {status['effects']['level']}")
@@ -57,13 +59,17 @@ def improved_demo():
     
     try:
         while True:
+            # Show alerts raised since the last command before prompting again
+            for alert in monitor.drain_alerts():
+                print(alert)
+            
             command = input("\n> ").strip().lower()
             
             if command == 'quit':
                 break
             elif command.startswith('add '):
                 drink_type = command.split()[1]
-                if drink_type in ['beer', 'wine', 'liquor', 'cocktail']:
+                if drink_type in _VALID_DRINKS:
                     monitor.add_drink(drink_type)
                     print(f"Added {drink_type}")
                     
@@ -120,8 +126,8 @@ def improved_demo():
                     print("Usage: time <minutes> (e.g., 'time 30')")
             
             elif command == 'chart':
-                recent_data = monitor.get_recent_data(minutes=30)
-                if recent_data:
+                recent_data = monitor.get_recent_arrays(minutes=30)
+                if len(recent_data['bac']):
                     fig = visualizer.create_real_time_chart(recent_data)
                     fig.show()
                 else:
@@ -186,6 +192,9 @@ def quick_demo():
     monitor.stop_monitoring()
 
 if __name__ == "__main__":
+    # Alerts are printed from drain_alerts; only show monitoring loop errors
+    configure_logging(logging.ERROR)
+    
     print("Choose demo type:")
     print("1. Interactive demo (manual control)")
     print("2. Quick demo (automatic)")
@@ -3,11 +3,11 @@ Main BAC Monitoring Application
 Demonstrates the real-time BAC monitoring system
 """
 
+import logging
 import time
-import threading
-from datetime import datetime
-from real_time_monitor import RealTimeBACMonitor
-from visualization import BACVisualizer
+from real_time_monitor import RealTimeBACMonitor, configure_logging
+
+_VALID_DRINKS = frozenset(('beer', 'wine', 'liquor', 'cocktail'))
 
 def demo_mode():
     """Run a demonstration of the BAC monitoring system"""
@@ -21,7 +21,10 @@ def demo_mode():
     
     # Initialize monitor
     monitor = RealTimeBACMonitor(weight, gender)
-    visualizer = BACVisualizer()
+    
+    # The charting stack (matplotlib, Plotly, Streamlit) is most of the start-up
+    # time, so it is only imported when a chart is first asked for
+    visualizer = None
     
     print(f"\nBAC Monitor initialized for {gender} weighing {weight} lbs")
     print("\nCommands:")
@@ -39,6 +42,10 @@ def demo_mode():
     
     try:
         while True:
+            # Show alerts raised since the last command before prompting again
+            for alert in monitor.drain_alerts():
+                print(alert)
+            
             command = input("\n> ").strip().lower()
             
             if command == 'quit':
@@ -51,27 +58,31 @@ def demo_mode():
                 print("Monitoring stopped")
             elif command.startswith('add '):
                 drink_type = command.split()[1]
-                if drink_type in ['beer', 'wine', 'liquor', 'cocktail']:
+                if drink_type in _VALID_DRINKS:
                     monitor.add_drink(drink_type)
                     print(f"Added {drink_type}")
                 else:
                     print("Invalid drink type. Use: beer, wine, liquor, or cocktail")
             elif command == 'status':
                 status = monitor.get_current_status()
-                print(f"\nCurrent BAC: {status['bac']:.3f}")
-                print(f"Status: {status['effects']['level']}")
-                print(f"Effects: {status['effects']['effects']}")
-                print(f"Recommendation: {status['effects']['recommendation']}")
-                print(f"Time to sober: {status['sober_time_hours']:.1f} hours")
-                print(f"Heart Rate: {status['sensors']['heart_rate']:.0f} BPM")
+                print(f"\nCurrent BAC: {status.bac:.3f}")
+                print(f"Status: {status.level}")
+                print(f"Effects: {status.effects['effects']}")
+                print(f"Recommendation: {status.recommendation}")
+                print(f"Time to sober: {status.sober_time_hours:.1f} hours")
+                print(f"Heart Rate: {status.heart_rate:.0f} BPM")
             elif command == 'chart':
-                recent_data = monitor.get_recent_data(minutes=30)
-                if recent_data:
+                from visualization import BACVisualizer
+                visualizer = visualizer or BACVisualizer()
+                recent_data = monitor.get_recent_arrays(minutes=30)
+                if len(recent_data['bac']):
                     fig = visualizer.create_real_time_chart(recent_data)
                     fig.show()
                 else:
                     print("No data available yet")
             elif command == 'gauge':
+                from visualization import BACVisualizer
+                visualizer = visualizer or BACVisualizer()
                 status = monitor.get_current_status()
                 fig = visualizer.create_bac_gauge(status['bac'])
                 fig.show()
@@ -88,6 +99,11 @@ def demo_mode():
 
 def simulation_mode():
     """Run a simulation with predefined drinking pattern"""
+    # Charts are only saved to files here, so skip GUI backend start-up
+    import matplotlib
+    matplotlib.use('Agg')
+    from visualization import BACVisualizer
+    
     print("🍺 BAC Monitoring Simulation")
     print("=" * 50)
     
@@ -116,13 +132,9 @@ def simulation_mode():
     for time_minutes, message in timeline:
         print(f"\n[{time_minutes:3d} min] {message}")
         
-        # Simulate time progression by adjusting the first drink time
-        if time_minutes > 0 and monitor.first_drink_time:
-            # Move the first drink time back by the time difference since last event
-            from datetime import timedelta
-            time_diff = time_minutes - previous_time
-            monitor.first_drink_time = monitor.first_drink_time - timedelta(minutes=time_diff)
-            monitor._update_bac()
+        # Fast-forward simulated time to this event (no real waiting)
+        if time_minutes > 0:
+            monitor.advance_simulated_time(time_minutes - previous_time)
         
         if drink_index < len(drinks):
             monitor.add_drink(drinks[drink_index])
@@ -132,10 +144,8 @@ def simulation_mode():
         status = monitor.get_current_status()
         print(f"   BAC: {status['bac']:.3f} - {status['effects']['level']}")
         print(f"   HR: {status['sensors']['heart_rate']:.0f} BPM")
-        
-        # Wait for next event
-        if time_minutes < 135:
-            time.sleep(30)  # 30 seconds between events
+        for alert in monitor.drain_alerts():
+            print(f"   {alert}")
         
         previous_time = time_minutes
     
@@ -150,30 +160,41 @@ def simulation_mode():
     print(f"Time to sober: {final_status['sober_time_hours']:.1f} hours")
     
     # Show charts
-    recent_data = monitor.get_recent_data(minutes=60)
-    if recent_data:
+    recent_data = monitor.get_recent_arrays(minutes=60)
+    if len(recent_data['bac']):
         print("\nGenerating charts...")
         
         # BAC gauge
-        gauge_fig = visualizer.create_bac_gauge(final_status['bac'])
-        gauge_fig.savefig('bac_gauge.png', dpi=150, bbox_inches='tight')
+        fig = visualizer.create_bac_gauge(final_status['bac'])
+        fig.savefig('bac_gauge.png', dpi=100, bbox_inches='tight')
         print("Saved: bac_gauge.png")
         
-        # Real-time chart
-        chart_fig = visualizer.create_real_time_chart(recent_data)
-        chart_fig.savefig('bac_chart.png', dpi=150, bbox_inches='tight')
+        # Real-time chart, redrawn on the gauge's figure
+        fig = visualizer.create_real_time_chart(recent_data, fig=fig)
+        fig.savefig('bac_chart.png', dpi=100, bbox_inches='tight')
         print("Saved: bac_chart.png")
         
+        # Projected Widmark curve for the drinks so far, in one vectorized call
+        fig = visualizer.create_bac_projection(monitor.bac_calculator, monitor.weight_lbs, monitor.gender,
+                                               monitor.drinks)
+        fig.savefig('bac_projection.png', dpi=100, bbox_inches='tight')
+        print("Saved: bac_projection.png")
+        
         # Interactive dashboard
         dashboard_fig = visualizer.create_interactive_dashboard(recent_data)
         if dashboard_fig:
-            dashboard_fig.write_html('bac_dashboard.html')
+            dashboard_fig.write_html('bac_dashboard.html', include_plotlyjs='cdn')
             print("Saved: bac_dashboard.html")
     
     monitor.stop_monitoring()
 
 def wearable_demo():
     """Demonstrate wearable device interface"""
+    # The display is only saved to a file, so skip GUI backend start-up
+    import matplotlib
+    matplotlib.use('Agg')
+    from visualization import BACVisualizer
+    
     print("⌚ Wearable Device BAC Monitor Demo")
     print("=" * 50)
     
@@ -195,7 +216,7 @@ def wearable_demo():
     # Show wearable display
     status = monitor.get_current_status()
     wearable_fig = visualizer.create_wearable_display(status)
-    wearable_fig.savefig('wearable_display.png', dpi=150, bbox_inches='tight', 
+    wearable_fig.savefig('wearable_display.png', dpi=100, bbox_inches='tight', 
                         facecolor='black')
     print("Saved: wearable_display.png")
     
@@ -203,6 +224,9 @@ def wearable_demo():
 
 def main():
     """Main application entry point"""
+    # Alerts are printed from drain_alerts; only show monitoring loop errors
+    configure_logging(logging.ERROR)
+    
     print("🍺 Blood Alcohol Content (BAC) Monitoring System")
     print("=" * 60)
     print("\nChoose a mode:")
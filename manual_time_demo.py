@@ -5,7 +5,7 @@ Shows how to manually add theoretical time to the BAC monitoring system
 
 import time
 from datetime import datetime, timedelta
-from real_time_monitor import RealTimeBACMonitor
+from real_time_monitor import RealTimeBACMonitor, configure_logging
 
 def manual_time_demo():
     """Demonstrate manual time simulation"""
@@ -94,11 +94,13 @@ def time_simulation_examples():
         (240, "4 hours")
     ]
     
+    offset = 0  # minutes the first drink has been moved back so far
     for minutes, description in time_scenarios:
         if monitor.first_drink_time:
-            # Reset to original time
-            original_time = monitor.first_drink_time + timedelta(minutes=sum([m for m, _ in time_scenarios[:time_scenarios.index((minutes, description))]]))
-            monitor.first_drink_time = original_time - timedelta(minutes=minutes)
+            # Move the first drink time back to `minutes` before now,
+            # relative to the offset already applied
+            monitor.first_drink_time = monitor.first_drink_time - timedelta(minutes=minutes - offset)
+            offset = minutes
             monitor._update_bac()
             
             status = monitor.get_current_status()
@@ -107,5 +109,6 @@ def time_simulation_examples():
     monitor.stop_monitoring()
 
 if __name__ == "__main__":
+    configure_logging()
     manual_time_demo()
     time_simulation_examples() 
\ No newline at end of file
@@ -3,22 +3,159 @@ Real-time BAC Monitoring System
 Simulates wearable device sensors and provides continuous BAC tracking
 """
 
+import atexit
+import bisect
+import logging
+import logging.handlers
+import sys
 import threading
 import time
 import queue
-import random
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import numpy as np
-from bac_calculator import BACCalculator
+from bac_calculator import BACCalculator, _LBS_TO_G, _widmark_bac, _widmark_bac_curve
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Records queued by the monitor's logger for the listener started by configure_logging
+_log_queue = queue.SimpleQueue()
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_listener = None
+
+def configure_logging(level=logging.WARNING):
+    """
+    Print the monitor's log records (alerts at WARNING, monitoring loop
+    errors at ERROR) to stdout as '[HH:MM:SS] message'
+    Scripts and apps call this once; without it the module's NullHandler
+    keeps them silent. Scripts that print drain_alerts() themselves pass
+    logging.ERROR so alerts aren't shown twice
+    
+    The monitoring thread only puts records on a queue; a QueueListener
+    on its own daemon thread does the writing, so a tick never waits on
+    the terminal. Pass level=None to stop the listener and detach it
+    """
+    global _log_listener
+    
+    if level is None:
+        if _log_listener is not None:
+            logger.removeHandler(_log_queue_handler)
+            _log_listener.stop()
+            _log_listener = None
+        return
+    
+    if _log_listener is None:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', '%H:%M:%S'))
+        _log_listener = logging.handlers.QueueListener(_log_queue, handler)
+        _log_listener.start()
+        logger.addHandler(_log_queue_handler)
+    logger.setLevel(level)
+
+def _stop_logging():
+    """Write out queued records before the interpreter exits"""
+    configure_logging(None)
+
+atexit.register(_stop_logging)
+
+# Monitoring history capacity: one day of 5 second ticks
+_HISTORY_SIZE = 24 * 3600 // 5
+
+_NS_PER_S = 1_000_000_000
+_NS_PER_HOUR = 3600 * _NS_PER_S
+_ONE_US = timedelta(microseconds=1)
+
+# How check_alerts_manually prints each alert level
+_MANUAL_ALERT_LABELS = {
+    'critical': "🚨 CRITICAL ALERT",
+    'danger': "⚠️  DANGER ALERT",
+    'warning': "⚠️  WARNING",
+}
+
+# Keys of the status dict that BACStatus replaces, in its order
+_STATUS_KEYS = ('bac', 'effects', 'sober_time_hours', 'sensors', 'drinks_count', 'time_since_last_drink')
+
+@dataclass(frozen=True)
+class BACStatus:
+    """
+    Snapshot of the monitor's current BAC, effects and sensor readings
+    Also readable like the dict it replaces, e.g. status['sensors']['heart_rate'],
+    status.get('bac'), 'effects' in status or dict(status); _asdict() gives
+    that dict as plain, JSON-serializable values
+    """
+    # Written out rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('bac', 'effects', 'sober_time_hours', 'heart_rate', 'skin_conductance',
+                 'temperature', 'drinks_count', 'time_since_last_drink')
+    
+    bac: float
+    effects: object  # read-only mapping from BACCalculator.get_bac_effects
+    sober_time_hours: float
+    heart_rate: float
+    skin_conductance: float
+    temperature: float
+    drinks_count: int
+    time_since_last_drink: float  # minutes
+    
+    @property
+    def level(self):
+        return self.effects['level']
+    
+    @property
+    def recommendation(self):
+        return self.effects['recommendation']
+    
+    @property
+    def sensors(self):
+        """Sensor readings as a dict (built on access)"""
+        return {
+            'heart_rate': self.heart_rate,
+            'skin_conductance': self.skin_conductance,
+            'temperature': self.temperature
+        }
+    
+    def __getitem__(self, key):
+        if key not in _STATUS_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return key in _STATUS_KEYS
+    
+    def __iter__(self):
+        return iter(_STATUS_KEYS)
+    
+    def __len__(self):
+        return len(_STATUS_KEYS)
+    
+    def keys(self):
+        return _STATUS_KEYS
+    
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _STATUS_KEYS else default
+    
+    def _asdict(self):
+        """The status as the dict it replaces (effects copied out of its read-only mapping)"""
+        status = {key: getattr(self, key) for key in _STATUS_KEYS}
+        status['effects'] = dict(self.effects)
+        return status
 
 class SensorSimulator:
     """Simulates wearable device sensors"""
     
-    def __init__(self):
+    __slots__ = ('_baseline_heart_rate', '_baseline_skin_conductance', '_baseline_temperature',
+                 '_baseline', '_inv_baseline', 'current_heart_rate', 'current_skin_conductance',
+                 'current_temperature', 'alcohol_effect', '_rng', '_gain', '_noise', '_lo', '_hi')
+    
+    def __init__(self, seed=None):
         # Baseline values (normal ranges)
-        self.baseline_heart_rate = 70  # BPM
-        self.baseline_skin_conductance = 5.0  # microsiemens
-        self.baseline_temperature = 98.6  # Fahrenheit
+        self.set_baseline(
+            heart_rate=70,  # BPM
+            skin_conductance=5.0,  # microsiemens
+            temperature=98.6  # Fahrenheit
+        )
         
         # Current values
         self.current_heart_rate = self.baseline_heart_rate
@@ -28,26 +165,85 @@ class SensorSimulator:
         # Alcohol effect simulation
         self.alcohol_effect = 0.0  # 0.0 to 1.0 scale
         
+        # Per-sensor model (heart rate, skin conductance, temperature): change per
+        # unit of BAC, uniform noise amplitude and plausible reading range
+        self._rng = np.random.default_rng(seed)
+        self._gain = np.array([20.0, 3.0, 2.0])
+        self._noise = np.array([2.0, 0.5, 0.5])
+        self._lo = np.array([50.0, 1.0, 95.0])
+        self._hi = np.array([120.0, np.inf, 102.0])
+    
+    def set_baseline(self, heart_rate, skin_conductance, temperature):
+        """Set the sober baseline readings"""
+        self._baseline_heart_rate = heart_rate
+        self._baseline_skin_conductance = skin_conductance
+        self._baseline_temperature = temperature
+        
+        # Baselines are fixed for the session, so deviations multiply by the
+        # precomputed reciprocals instead of dividing every tick
+        self._baseline = np.array([heart_rate, skin_conductance, temperature], dtype=np.float64)
+        self._inv_baseline = 1.0 / self._baseline
+    
+    # Assigning a single baseline goes through set_baseline so the arrays above stay in step
+    
+    @property
+    def baseline_heart_rate(self):
+        return self._baseline_heart_rate
+    
+    @baseline_heart_rate.setter
+    def baseline_heart_rate(self, value):
+        self.set_baseline(value, self._baseline_skin_conductance, self._baseline_temperature)
+    
+    @property
+    def baseline_skin_conductance(self):
+        return self._baseline_skin_conductance
+    
+    @baseline_skin_conductance.setter
+    def baseline_skin_conductance(self, value):
+        self.set_baseline(self._baseline_heart_rate, value, self._baseline_temperature)
+    
+    @property
+    def baseline_temperature(self):
+        return self._baseline_temperature
+    
+    @baseline_temperature.setter
+    def baseline_temperature(self, value):
+        self.set_baseline(self._baseline_heart_rate, self._baseline_skin_conductance, value)
+    
+    def deviations(self, readings=None):
+        """
+        Relative deviation of each reading from its baseline, for the current
+        readings or an array of (heart_rate, skin_conductance, temperature) rows
+        """
+        if readings is None:
+            readings = np.array([self.current_heart_rate, self.current_skin_conductance, self.current_temperature])
+        return (readings - self._baseline) * self._inv_baseline
+    
+    def draw_noise(self, size=None):
+        """Sensor noise for one update, or for `size` updates as rows"""
+        shape = 3 if size is None else (size, 3)
+        return self._rng.uniform(-1.0, 1.0, shape) * self._noise
+    
+    def readings_for(self, bac_level, noise):
+        """
+        Sensor readings (heart_rate, skin_conductance, temperature) for a BAC
+        level and drawn noise; an array of BAC levels gives one row per level
+        """
+        # Simulate alcohol effects on all three sensors at once:
+        # BAC of 0.1 increases HR by ~2 BPM, alcohol increases skin conductance
+        # and can affect body temperature
+        readings = self._baseline + np.multiply.outer(bac_level, self._gain)
+        
+        # Add some realistic noise and keep readings in range
+        readings += noise
+        return np.clip(readings, self._lo, self._hi, out=readings)
+        
     def update_sensors(self, bac_level):
         """
         Update sensor readings based on current BAC level
         """
-        # Simulate alcohol effects on heart rate
-        hr_increase = bac_level * 20  # BAC of 0.1 increases HR by ~2 BPM
-        self.current_heart_rate = self.baseline_heart_rate + hr_increase + random.uniform(-2, 2)
-        
-        # Simulate alcohol effects on skin conductance
-        sc_increase = bac_level * 3.0  # Alcohol increases skin conductance
-        self.current_skin_conductance = self.baseline_skin_conductance + sc_increase + random.uniform(-0.5, 0.5)
-        
-        # Simulate alcohol effects on temperature
-        temp_change = bac_level * 2.0  # Alcohol can affect body temperature
-        self.current_temperature = self.baseline_temperature + temp_change + random.uniform(-0.5, 0.5)
-        
-        # Add some realistic noise
-        self.current_heart_rate = max(50, min(120, self.current_heart_rate))
-        self.current_skin_conductance = max(1.0, self.current_skin_conductance)
-        self.current_temperature = max(95.0, min(102.0, self.current_temperature))
+        readings = self.readings_for(bac_level, self.draw_noise())
+        self.current_heart_rate, self.current_skin_conductance, self.current_temperature = readings.tolist()
 
 class RealTimeBACMonitor:
     """Main real-time BAC monitoring system"""
@@ -56,40 +252,98 @@ class RealTimeBACMonitor:
         self.bac_calculator = BACCalculator()
         self.sensor_simulator = SensorSimulator()
         
-        # User profile
+        # User profile (setting either resolves _r_weight_grams)
         self.weight_lbs = weight_lbs
         self.gender = gender
         
-        # Drink tracking
-        self.drinks = []
-        self.first_drink_time = None
+        # Drink tracking, stored as parallel arrays (see the drinks property)
+        self._vol = np.empty(16, dtype=np.float32)  # volume (oz)
+        self._pct = np.empty(16, dtype=np.float32)  # alcohol percent
+        self._ts = np.empty(16, dtype=np.float64)   # unix timestamp (seconds)
+        self._n = 0
+        self._first_drink_time = None
+        self._first_drink_ns = None  # time.monotonic_ns() of the first drink
         self.last_drink_time = None
+        self._last_drink_ns = None   # time.monotonic_ns() of the last drink
+        self._total_alcohol_grams = 0.0  # running sum over all drinks
         
         # Real-time data
         self.current_bac = 0.0
-        self.bac_history = []
-        self.sensor_history = []
+        
+        # Monitoring history, stored as a ring buffer of parallel arrays
+        # (see _record_history and get_recent_data)
+        self._hist_ts = np.empty(_HISTORY_SIZE, dtype='datetime64[ms]')
+        self._hist_bac = np.empty(_HISTORY_SIZE, dtype=np.float32)
+        self._hist_hr = np.empty(_HISTORY_SIZE, dtype=np.float32)
+        self._hist_sc = np.empty(_HISTORY_SIZE, dtype=np.float32)
+        self._hist_temp = np.empty(_HISTORY_SIZE, dtype=np.float32)
+        self._head = 0   # next slot to write
+        self._count = 0  # valid samples, at most _HISTORY_SIZE
+        
+        # Status cache, valid while _tick is unchanged (bumped whenever BAC or sensors change)
+        self._tick = 0
+        self._status_cache = None
+        self._status_tick = -1
         
         # Monitoring control
         self.is_monitoring = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()  # set by stop_monitoring to end the loop
         self.data_queue = queue.Queue()
+        self._wake = threading.Condition()  # notified on drinks, resets and stop
+        self._wake_loop = threading.Event()  # cuts the loop's wait short for a new drink or stop
+        self._sampled = threading.Event()  # set once a sample includes every drink added so far
+        self._drink_seq = 0  # drinks added, so a sample can tell whether it saw the latest
+        # Held by the monitoring loop for each tick and by anything else that writes
+        # drinks or history (or reads history), so their updates never interleave
+        self._lock = threading.Lock()
         
-        # Alert thresholds
-        self.alert_thresholds = {
+        # Alert thresholds (read-only; change them with set_alert_thresholds so
+        # the sorted levels used for bisecting stay in step)
+        self.alert_thresholds = MappingProxyType({
             'warning': 0.05,
             'danger': 0.08,
             'critical': 0.15
-        }
+        })
+        self._resolve_alert_levels()
         
         # Alert state tracking (to prevent spam)
         self.last_alert_level = None
-        self.last_alert_time = None
+        self._last_alert_ns = None  # time.monotonic_ns() of the last alert
         self.alert_cooldown = 30  # seconds between repeated alerts
+        self._alerts = deque(maxlen=100)  # sent alerts not yet read by drain_alerts
+    
+    @property
+    def weight_lbs(self):
+        return self._weight_lbs
+    
+    @weight_lbs.setter
+    def weight_lbs(self, value):
+        self._weight_lbs = value
+        self._resolve_profile()
+    
+    @property
+    def gender(self):
+        return self._gender
+    
+    @gender.setter
+    def gender(self, value):
+        self._gender = value.strip().lower()  # canonical form, normalized once
+        self.bac_calculator.set_gender(self._gender)
+        self._resolve_profile()
+    
+    def _resolve_profile(self):
+        """
+        Multiply out the Widmark factor and body weight (grams) once per
+        profile change; per tick only the alcohol total and time vary
+        """
+        self._r_weight_grams = self.bac_calculator._r * (self._weight_lbs * _LBS_TO_G)
     
     def start_monitoring(self):
         """Start real-time monitoring"""
         if not self.is_monitoring:
+            self._stop_event.clear()
+            self._sampled.clear()
             self.is_monitoring = True
             self.monitor_thread = threading.Thread(target=self._monitor_loop)
             self.monitor_thread.daemon = True
@@ -99,74 +353,173 @@ class RealTimeBACMonitor:
     def stop_monitoring(self):
         """Stop real-time monitoring"""
         self.is_monitoring = False
+        self._stop_event.set()
+        self._wake_loop.set()
+        self._notify_change()
         if self.monitor_thread:
             self.monitor_thread.join()
         print("BAC monitoring stopped.")
     
+    def _notify_change(self):
+        """Wake any thread blocked in wait_for_change"""
+        with self._wake:
+            self._wake.notify_all()
+    
+    def wait_for_change(self, timeout=None):
+        """
+        Block until a drink is added, the session is reset or monitoring
+        stops, or until timeout seconds pass
+        Returns False if the timeout expired
+        """
+        with self._wake:
+            return self._wake.wait(timeout)
+    
+    def wait_for_sample(self, timeout=None):
+        """
+        Block until the monitoring loop has recorded a sample (and checked
+        alerts) since monitoring started and since the last drink was added,
+        or until timeout seconds pass
+        Returns False if the timeout expired
+        """
+        return self._sampled.wait(timeout)
+    
     def _monitor_loop(self):
         """Main monitoring loop"""
-        while self.is_monitoring:
+        while not self._stop_event.is_set():
             try:
-                # Update current BAC
-                self._update_bac()
-                
-                # Update sensor readings
-                self.sensor_simulator.update_sensors(self.current_bac)
-                
-                # Record data
-                timestamp = datetime.now()
-                data_point = {
-                    'timestamp': timestamp,
-                    'bac': self.current_bac,
-                    'heart_rate': self.sensor_simulator.current_heart_rate,
-                    'skin_conductance': self.sensor_simulator.current_skin_conductance,
-                    'temperature': self.sensor_simulator.current_temperature
-                }
+                with self._lock:
+                    drink_seq = self._drink_seq
+                    
+                    # One clock read per tick, shared by the BAC update and alert throttling
+                    now_ns = time.monotonic_ns()
+                    
+                    # Update current BAC
+                    self._update_bac(now_ns)
+                    
+                    # Update sensor readings
+                    self.sensor_simulator.update_sensors(self.current_bac)
+                    self._tick += 1
+                    
+                    # Record data (wall-clock time only for display)
+                    data_point = {
+                        'timestamp': datetime.now(),
+                        'bac': self.current_bac,
+                        'heart_rate': self.sensor_simulator.current_heart_rate,
+                        'skin_conductance': self.sensor_simulator.current_skin_conductance,
+                        'temperature': self.sensor_simulator.current_temperature
+                    }
+                    
+                    self._record_history(data_point)
+                    
+                    # Check for alerts
+                    self._check_alerts(now_ns)
+                    
+                    # Add to queue for external access
+                    self.data_queue.put(data_point)
+                    if drink_seq == self._drink_seq:
+                        self._sampled.set()
                 
-                self.bac_history.append(data_point)
-                self.sensor_history.append(data_point)
+                # Wait 5 seconds (less frequent updates to reduce spam);
+                # a new drink or stop_monitoring wakes the loop early
+                if self._wake_loop.wait(5):
+                    self._wake_loop.clear()
                 
-                # Check for alerts
-                self._check_alerts()
-                
-                # Add to queue for external access
-                self.data_queue.put(data_point)
-                
-                # Sleep for 5 seconds (less frequent updates to reduce spam)
-                time.sleep(5)
-                
-            except Exception as e:
-                print(f"Error in monitoring loop: {e}")
-                time.sleep(1)
+            except Exception:
+                logger.exception("Error in monitoring loop")
+                self._stop_event.wait(1)
+    
+    def _record_history(self, data_point):
+        """Write a data point into the history ring buffer, overwriting the oldest when full"""
+        head = self._head
+        self._hist_ts[head] = data_point['timestamp']
+        self._hist_bac[head] = data_point['bac']
+        self._hist_hr[head] = data_point['heart_rate']
+        self._hist_sc[head] = data_point['skin_conductance']
+        self._hist_temp[head] = data_point['temperature']
+        self._head = (head + 1) % _HISTORY_SIZE
+        self._count = min(self._count + 1, _HISTORY_SIZE)
     
-    def _update_bac(self):
-        """Update current BAC using both calculation methods"""
-        if not self.drinks:
+    def _record_history_block(self, timestamps, bac, readings):
+        """Write consecutive samples (readings as rows) into the history ring buffer at once"""
+        if len(bac) > _HISTORY_SIZE:
+            timestamps, bac, readings = timestamps[-_HISTORY_SIZE:], bac[-_HISTORY_SIZE:], readings[-_HISTORY_SIZE:]
+        n = len(bac)
+        idx = (self._head + np.arange(n)) % _HISTORY_SIZE
+        self._hist_ts[idx] = timestamps
+        self._hist_bac[idx] = bac
+        self._hist_hr[idx] = readings[:, 0]
+        self._hist_sc[idx] = readings[:, 1]
+        self._hist_temp[idx] = readings[:, 2]
+        self._head = (self._head + n) % _HISTORY_SIZE
+        self._count = min(self._count + n, _HISTORY_SIZE)
+    
+    def _history_indices(self, cutoff_time=None):
+        """
+        Ring buffer slots holding history newer than cutoff_time (a datetime64),
+        oldest first; all of it if cutoff_time is None
+        Timestamps are sorted within each side of the wrap point, so the
+        cutoff is found by binary search instead of a scan
+        """
+        head, count = self._head, self._count
+        ts = self._hist_ts
+        
+        if count < _HISTORY_SIZE:
+            # Not wrapped yet: slots 0..count-1 in order
+            start = 0 if cutoff_time is None else int(np.searchsorted(ts[:count], cutoff_time, side='right'))
+            return slice(start, count)
+        
+        # Full: oldest samples in slots head..end, newest in 0..head-1
+        if cutoff_time is None or ts[-1] > cutoff_time:
+            start = head if cutoff_time is None else head + int(np.searchsorted(ts[head:], cutoff_time, side='right'))
+            return np.r_[start:_HISTORY_SIZE, 0:head]
+        return slice(int(np.searchsorted(ts[:head], cutoff_time, side='right')), head)
+    
+    def _history_points(self, idx):
+        """History data points at the given ring buffer slots, as a list of dicts"""
+        return [
+            {'timestamp': ts, 'bac': bac, 'heart_rate': hr, 'skin_conductance': sc, 'temperature': temp}
+            for ts, bac, hr, sc, temp in zip(
+                self._hist_ts[idx].tolist(), self._hist_bac[idx].tolist(), self._hist_hr[idx].tolist(),
+                self._hist_sc[idx].tolist(), self._hist_temp[idx].tolist()
+            )
+        ]
+    
+    @property
+    def bac_history(self):
+        """All recorded monitoring data as a list of dicts (built on access)"""
+        with self._lock:
+            return self._history_points(self._history_indices())
+    
+    sensor_history = bac_history
+    
+    def _update_bac(self, now_ns=None):
+        """
+        Update current BAC using both calculation methods
+        now_ns is the time.monotonic_ns() reading to use (read here if not given)
+        """
+        self._tick += 1
+        
+        if not self._n:
             self.current_bac = 0.0
             return
         
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        
         # Calculate time since first drink
         hours_since_first = 0
-        if self.first_drink_time:
-            hours_since_first = (datetime.now() - self.first_drink_time).total_seconds() / 3600
+        if self._first_drink_ns is not None:
+            hours_since_first = (now_ns - self._first_drink_ns) / _NS_PER_HOUR
         
         # Method 1: Widmark formula (more accurate for known consumption)
-        calculated_bac = self.bac_calculator.calculate_bac_widmark(
-            self.weight_lbs, self.gender, self.drinks, hours_since_first
-        )
+        calculated_bac = _widmark_bac(self._total_alcohol_grams, self._r_weight_grams,
+                                      self.bac_calculator.metabolism_rate, hours_since_first)
         
         # Method 2: Sensor-based estimation (for real-time monitoring)
-        if self.last_drink_time:
-            sensor_bac = self.bac_calculator.estimate_bac_from_sensors(
-                self.sensor_simulator.current_heart_rate,
-                self.sensor_simulator.current_skin_conductance,
-                self.sensor_simulator.current_temperature,
-                self.sensor_simulator.baseline_heart_rate,
-                self.sensor_simulator.baseline_skin_conductance,
-                self.sensor_simulator.baseline_temperature,
-                self.last_drink_time,
-                self.weight_lbs,
-                self.gender
+        if self._last_drink_ns is not None:
+            sensor_bac = self.bac_calculator.estimate_bac_from_deviations(
+                self.sensor_simulator.deviations(),
+                (now_ns - self._last_drink_ns) / _NS_PER_HOUR
             )
             
             # Combine both methods (weighted average)
@@ -174,116 +527,291 @@ class RealTimeBACMonitor:
         else:
             self.current_bac = calculated_bac
     
-    def _check_alerts(self):
-        """Check for BAC level alerts with smart throttling"""
-        effects = self.bac_calculator.get_bac_effects(self.current_bac)
-        current_time = datetime.now()
+    def _check_alerts(self, now_ns=None):
+        """
+        Check for BAC level alerts with smart throttling
+        now_ns is the time.monotonic_ns() reading to use (read here if not given)
+        """
+        # Below the lowest threshold there is nothing to send (and the alert
+        # state is left as it is), which is the common case
+        if self.current_bac < self._alert_levels[0]:
+            return
+        
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
         
         # Determine current alert level
-        current_alert_level = None
-        if self.current_bac >= self.alert_thresholds['critical']:
-            current_alert_level = 'critical'
-        elif self.current_bac >= self.alert_thresholds['danger']:
-            current_alert_level = 'danger'
-        elif self.current_bac >= self.alert_thresholds['warning']:
-            current_alert_level = 'warning'
+        current_alert_level = self._alert_names[bisect.bisect_right(self._alert_levels, self.current_bac) - 1]
         
         # Only send alert if:
         # 1. Alert level has changed, OR
         # 2. It's been more than cooldown time since last alert
-        should_alert = False
-        
-        if current_alert_level != self.last_alert_level:
-            # Alert level changed - always alert
-            should_alert = True
-        elif (current_alert_level and 
-              (not self.last_alert_time or 
-               (current_time - self.last_alert_time).total_seconds() > self.alert_cooldown)):
-            # Same alert level but cooldown has passed
-            should_alert = True
-        
-        if should_alert and current_alert_level:
-            if current_alert_level == 'critical':
-                self._send_alert("CRITICAL", f"BAC: {self.current_bac:.3f} - {effects['recommendation']}")
-            elif current_alert_level == 'danger':
-                self._send_alert("DANGER", f"BAC: {self.current_bac:.3f} - {effects['recommendation']}")
-            elif current_alert_level == 'warning':
-                self._send_alert("WARNING", f"BAC: {self.current_bac:.3f} - {effects['recommendation']}")
+        if (current_alert_level != self.last_alert_level or
+                self._last_alert_ns is None or
+                now_ns - self._last_alert_ns > self.alert_cooldown * _NS_PER_S):
+            effects = self.bac_calculator.get_bac_effects(self.current_bac)
+            self._send_alert(current_alert_level.upper(), f"BAC: {self.current_bac:.3f} - {effects['recommendation']}")
             
             # Update alert state
             self.last_alert_level = current_alert_level
-            self.last_alert_time = current_time
+            self._last_alert_ns = now_ns
     
     def _send_alert(self, level, message):
-        """Send alert (in real implementation, this would trigger notifications)"""
+        """
+        Send alert (in real implementation, this would trigger notifications)
+        Alerts are queued for drain_alerts and logged rather than printed, so
+        the monitoring thread never blocks on the console
+        """
         timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] {level} ALERT: {message}")
+        self._alerts.append(f"[{timestamp}] {level} ALERT: {message}")
+        logger.warning("%s ALERT: %s", level, message)
+    
+    def drain_alerts(self):
+        """Return the alerts sent since the last call, oldest first, and clear them"""
+        alerts = []
+        while self._alerts:
+            alerts.append(self._alerts.popleft())
+        return alerts
     
     def add_drink(self, drink_type, volume_oz=None, alcohol_percent=None):
         """Add a drink to the tracking system"""
         drink_info = self.bac_calculator.add_drink(drink_type, volume_oz, alcohol_percent)
-        drink_info['timestamp'] = datetime.now()
         
-        self.drinks.append(drink_info)
-        
-        if not self.first_drink_time:
-            self.first_drink_time = datetime.now()
-        
-        self.last_drink_time = datetime.now()
-        
-        # Update BAC immediately after adding drink
-        self._update_bac()
+        with self._lock:
+            # Grow the drink arrays by doubling when full
+            if self._n == len(self._vol):
+                self._vol = np.resize(self._vol, 2 * self._n)
+                self._pct = np.resize(self._pct, 2 * self._n)
+                self._ts = np.resize(self._ts, 2 * self._n)
+            
+            self._vol[self._n] = drink_info['volume_oz']
+            self._pct[self._n] = drink_info['alcohol_percent']
+            now = datetime.now()
+            now_ns = time.monotonic_ns()
+            self._ts[self._n] = now.timestamp()
+            self._n += 1
+            self._total_alcohol_grams += drink_info['alcohol_grams']
+            
+            if not self._first_drink_time:
+                self._first_drink_time = now
+                self._first_drink_ns = now_ns
+            
+            self.last_drink_time = now
+            self._last_drink_ns = now_ns
+            
+            # Update BAC immediately after adding drink, and have the monitoring
+            # loop sample it (and check alerts) without waiting for its next tick
+            self._update_bac(now_ns)
+            self._drink_seq += 1
+            self._sampled.clear()
+            self._wake_loop.set()
+        self._notify_change()
         
         print(f"Added drink: {drink_type} at {self.last_drink_time.strftime('%H:%M:%S')}")
     
+    @property
+    def first_drink_time(self):
+        """Wall-clock time of the first drink (for display)"""
+        return self._first_drink_time
+    
+    @first_drink_time.setter
+    def first_drink_time(self, value):
+        # BAC is computed from the monotonic anchor; moving the first drink
+        # (e.g. to simulate time passing) moves the anchor by the same amount
+        if value is None:
+            self._first_drink_ns = None
+        elif self._first_drink_time is None:
+            self._first_drink_ns = time.monotonic_ns() - (datetime.now() - value) // _ONE_US * 1000
+        else:
+            self._first_drink_ns += (value - self._first_drink_time) // _ONE_US * 1000
+        self._first_drink_time = value
+    
+    @property
+    def drinks(self):
+        """Drinks consumed this session as a list of dicts (built on access, for display)"""
+        n = self._n
+        # Volume and percent are stored as float32; round off the float32 noise for display
+        vol = self._vol[:n].astype(np.float64).round(4).tolist()
+        pct = self._pct[:n].astype(np.float64).round(4).tolist()
+        return [
+            {'alcohol_percent': p, 'volume_oz': v, 'timestamp': datetime.fromtimestamp(ts)}
+            for v, p, ts in zip(vol, pct, self._ts[:n].tolist())
+        ]
+    
     def get_current_status(self):
-        """Get current BAC status and effects"""
-        effects = self.bac_calculator.get_bac_effects(self.current_bac)
-        sober_time = self.bac_calculator.calculate_sober_time(self.current_bac)
+        """
+        Get current BAC status and effects as an immutable BACStatus
+        While monitoring, the result is cached until the next BAC or sensor
+        update, so time_since_last_drink is as of that update; otherwise
+        nothing else advances the BAC, so it is brought up to date here
+        """
+        if not self.is_monitoring:
+            with self._lock:
+                self._update_bac()
+        elif self._status_tick == self._tick:
+            return self._status_cache
         
-        return {
-            'bac': self.current_bac,
-            'effects': effects,
-            'sober_time_hours': sober_time,
-            'sensors': {
-                'heart_rate': self.sensor_simulator.current_heart_rate,
-                'skin_conductance': self.sensor_simulator.current_skin_conductance,
-                'temperature': self.sensor_simulator.current_temperature
-            },
-            'drinks_count': len(self.drinks),
-            'time_since_last_drink': (datetime.now() - self.last_drink_time).total_seconds() / 60 if self.last_drink_time else 0
-        }
+        sensors = self.sensor_simulator
+        self._status_tick = self._tick
+        self._status_cache = BACStatus(
+            bac=self.current_bac,
+            effects=self.bac_calculator.get_bac_effects(self.current_bac),
+            sober_time_hours=self.bac_calculator.calculate_sober_time(self.current_bac),
+            heart_rate=sensors.current_heart_rate,
+            skin_conductance=sensors.current_skin_conductance,
+            temperature=sensors.current_temperature,
+            drinks_count=self._n,
+            time_since_last_drink=(time.monotonic_ns() - self._last_drink_ns) / (60 * _NS_PER_S) if self._last_drink_ns is not None else 0
+        )
+        return self._status_cache
     
     def get_recent_data(self, minutes=30):
         """Get recent monitoring data"""
-        cutoff_time = datetime.now() - timedelta(minutes=minutes)
-        recent_data = [point for point in self.bac_history if point['timestamp'] > cutoff_time]
-        return recent_data
+        with self._lock:
+            cutoff_time = np.datetime64(datetime.now() - timedelta(minutes=minutes), 'ms')
+            return self._history_points(self._history_indices(cutoff_time))
+    
+    def get_recent_arrays(self, minutes=30):
+        """
+        Get recent monitoring data as arrays keyed like the data points
+        ('timestamp' as datetime64[ms], then 'bac', 'heart_rate',
+        'skin_conductance' and 'temperature'), oldest first
+        Until the history wraps these are views into the history buffer,
+        so use them before the session is reset or time is advanced
+        """
+        with self._lock:
+            cutoff_time = np.datetime64(datetime.now() - timedelta(minutes=minutes), 'ms')
+            idx = self._history_indices(cutoff_time)
+            return {
+                'timestamp': self._hist_ts[idx],
+                'bac': self._hist_bac[idx],
+                'heart_rate': self._hist_hr[idx],
+                'skin_conductance': self._hist_sc[idx],
+                'temperature': self._hist_temp[idx]
+            }
+    
+    def advance_simulated_time(self, minutes, step_seconds=5):
+        """
+        Fast-forward the session by `minutes` without waiting: every recorded
+        time (drinks, history, alerts) moves back by that amount, and the gap
+        is filled with monitoring samples every `step_seconds`
+        """
+        with self._lock:
+            delta = timedelta(minutes=minutes)
+            delta_ns = delta // _ONE_US * 1000
+            
+            if self._first_drink_time is not None:
+                self._first_drink_time -= delta
+                self._first_drink_ns -= delta_ns
+            if self.last_drink_time is not None:
+                self.last_drink_time -= delta
+                self._last_drink_ns -= delta_ns
+            if self._last_alert_ns is not None:
+                self._last_alert_ns -= delta_ns
+            self._ts[:self._n] -= delta.total_seconds()
+            self._hist_ts -= np.timedelta64(delta_ns // 1_000_000, 'ms')
+            
+            # Samples for the skipped interval, as the monitoring loop would have recorded them
+            now = datetime.now()
+            now_ns = time.monotonic_ns()
+            steps = int(delta.total_seconds() // step_seconds)
+            if steps:
+                seconds_before_now = np.arange(steps - 1, -1, -1, dtype=np.int64) * step_seconds
+                bac, readings = self._simulate_window(now_ns - seconds_before_now * _NS_PER_S)
+                self._record_history_block(np.datetime64(now, 'ms') - seconds_before_now.astype('timedelta64[s]'),
+                                           bac, readings)
+                
+                sensors = self.sensor_simulator
+                sensors.current_heart_rate, sensors.current_skin_conductance, sensors.current_temperature = readings[-1].tolist()
+            
+            self._update_bac(now_ns)
+            self._check_alerts(now_ns)
+    
+    def _simulate_window(self, t_ns):
+        """
+        BAC and sensor readings (as rows) at each of the ascending monotonic
+        times t_ns, following the monitor loop's recurrence: each BAC blends the
+        Widmark curve with the sensor estimate from the readings before it
+        """
+        n = len(t_ns)
+        sensors = self.sensor_simulator
+        calculator = self.bac_calculator
+        noise = sensors.draw_noise(n)
+        
+        if not self._n:
+            bac = np.zeros(n)
+            return bac, sensors.readings_for(bac, noise)
+        
+        hours_since_first = 0.0
+        if self._first_drink_ns is not None:
+            hours_since_first = (t_ns - self._first_drink_ns) / _NS_PER_HOUR
+        calculated_bac = _widmark_bac_curve(self._total_alcohol_grams, self._r_weight_grams,
+                                            calculator.metabolism_rate, hours_since_first)
+        calculated_bac = np.broadcast_to(calculated_bac, (n,))
+        if self._last_drink_ns is None:
+            return calculated_bac.copy(), sensors.readings_for(calculated_bac, noise)
+        
+        # Sensors rarely pass their thresholds, so first assume no step gets a
+        # sensor contribution, which makes every step independent
+        bac = 0.7 * calculated_bac
+        readings = sensors.readings_for(bac, noise)
+        score = calculator.sensor_score(sensors.deviations(readings))
+        prev_score = np.concatenate(([calculator.sensor_score(sensors.deviations())], score[:-1]))
+        
+        # From the first step that does get one, follow the recurrence step by step
+        contributing = np.flatnonzero(prev_score > 0)
+        if contributing.size:
+            decay = np.exp(-calculator.metabolism_rate * (t_ns - self._last_drink_ns) / _NS_PER_HOUR)
+            last_score = prev_score[contributing[0]]
+            for k in range(contributing[0], n):
+                bac[k] = 0.7 * calculated_bac[k] + 0.3 * max(0.0, last_score * decay[k])
+                readings[k] = sensors.readings_for(bac[k], noise[k])
+                last_score = calculator.sensor_score(sensors.deviations(readings[k]))
+        
+        return bac, readings
     
     def reset_session(self):
         """Reset the current drinking session"""
-        self.drinks = []
-        self.first_drink_time = None
-        self.last_drink_time = None
-        self.current_bac = 0.0
-        self.bac_history = []
-        self.sensor_history = []
-        self.last_alert_level = None
-        self.last_alert_time = None
+        with self._lock:
+            self._n = 0
+            self.first_drink_time = None
+            self.last_drink_time = None
+            self._last_drink_ns = None
+            self._total_alcohol_grams = 0.0
+            self.current_bac = 0.0
+            self._head = 0
+            self._count = 0
+            self.last_alert_level = None
+            self._last_alert_ns = None
+            self._alerts.clear()
+            self._tick += 1
+        self._notify_change()
         print("Session reset - starting fresh monitoring")
     
     def check_alerts_manually(self):
         """Manually check and display current alert status"""
         effects = self.bac_calculator.get_bac_effects(self.current_bac)
         
-        if self.current_bac >= self.alert_thresholds['critical']:
-            print(f"🚨 CRITICAL ALERT: BAC {self.current_bac:.3f} - {effects['recommendation']}")
-        elif self.current_bac >= self.alert_thresholds['danger']:
-            print(f"⚠️  DANGER ALERT: BAC {self.current_bac:.3f} - {effects['recommendation']}")
-        elif self.current_bac >= self.alert_thresholds['warning']:
-            print(f"⚠️  WARNING: BAC {self.current_bac:.3f} - {effects['recommendation']}")
-        else:
+        # Same level lookup as _check_alerts
+        index = bisect.bisect_right(self._alert_levels, self.current_bac) - 1
+        if index < 0:
             print(f"✅ SAFE: BAC {self.current_bac:.3f} - {effects['effects']}")
+            return
+        
+        level = self._alert_names[index]
+        label = _MANUAL_ALERT_LABELS.get(level, f"⚠️  {level.upper()} ALERT")
+        print(f"{label}: BAC {self.current_bac:.3f} - {effects['recommendation']}")
+    
+    def _resolve_alert_levels(self):
+        """Sort alert_thresholds into parallel tuples for bisecting"""
+        levels = sorted(self.alert_thresholds.items(), key=lambda item: item[1])
+        self._alert_names = tuple(name for name, _ in levels)
+        self._alert_levels = tuple(threshold for _, threshold in levels)
+    
+    def set_alert_thresholds(self, **thresholds):
+        """Change alert thresholds, e.g. set_alert_thresholds(warning=0.04)"""
+        self.alert_thresholds = MappingProxyType({**self.alert_thresholds, **thresholds})
+        self._resolve_alert_levels()
     
     def set_alert_cooldown(self, seconds):
         """Set the cooldown time between repeated alerts"""
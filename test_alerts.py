@@ -2,10 +2,16 @@
 Test the improved alert system
 """
 
-import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from real_time_monitor import RealTimeBACMonitor
 
+def print_alerts(monitor):
+    """Print the alerts raised since the last check and return their levels"""
+    alerts = monitor.drain_alerts()
+    for alert in alerts:
+        print(f"   {alert}")
+    return [alert.split()[1] for alert in alerts]
+
 def test_alert_system():
     """Test the improved alert system"""
     print("🔔 Testing Improved Alert System")
@@ -19,7 +25,7 @@ def test_alert_system():
     
     print("\nStarting monitoring...")
     monitor.start_monitoring()
-    time.sleep(1)
+    monitor.wait_for_sample(timeout=1)
     
     # Set a short cooldown for testing
     monitor.set_alert_cooldown(10)  # 10 seconds between repeated alerts
@@ -29,12 +35,12 @@ def test_alert_system():
     # Add first drink
     print("\n1. Adding 1 beer...")
     monitor.add_drink('beer')
-    time.sleep(2)
+    monitor.wait_for_sample(timeout=1)
+    assert print_alerts(monitor) == []
     
     # Simulate time passing to get BAC up
     print("\n2. Simulating 30 minutes passing...")
     if monitor.first_drink_time:
-        from datetime import timedelta
         monitor.first_drink_time = monitor.first_drink_time - timedelta(minutes=30)
         monitor._update_bac()
     
@@ -44,7 +50,8 @@ def test_alert_system():
     # Add second drink to trigger warning
     print("\n3. Adding 1 shot (should trigger warning)...")
     monitor.add_drink('liquor')
-    time.sleep(2)
+    monitor.wait_for_sample(timeout=1)
+    assert print_alerts(monitor) == ['WARNING']
     
     status = monitor.get_current_status()
     print(f"   BAC: {status['bac']:.3f} - {status['effects']['level']}")
@@ -52,11 +59,18 @@ def test_alert_system():
     # Add third drink to trigger danger
     print("\n4. Adding another beer (should trigger danger)...")
     monitor.add_drink('beer')
-    time.sleep(2)
+    monitor.wait_for_sample(timeout=1)
+    levels = print_alerts(monitor)
     
     status = monitor.get_current_status()
     print(f"   BAC: {status['bac']:.3f} - {status['effects']['level']}")
     
+    # Still at warning level, the repeat is held back by the cooldown
+    if status['bac'] >= monitor.alert_thresholds['danger']:
+        assert levels == ['DANGER'], levels
+    else:
+        assert levels == [], levels
+    
     print("\n" + "=" * 50)
     print("ALERT SYSTEM TEST RESULTS")
     print("=" * 50)
@@ -70,6 +84,16 @@ def test_alert_system():
     monitor.check_alerts_manually()
     
     monitor.stop_monitoring()
+    
+    # Same level within the cooldown: nothing; with no cooldown: the repeat goes out
+    print("\nThrottle check:")
+    level = levels[-1] if levels else 'WARNING'
+    monitor._check_alerts()
+    assert print_alerts(monitor) == []
+    monitor.set_alert_cooldown(0)
+    monitor._check_alerts()
+    assert print_alerts(monitor) == [level]
+    
     print("\nTest completed!")
 
 if __name__ == "__main__":
@@ -3,11 +3,10 @@ Test script for the BAC Monitoring System
 Verifies all components work correctly
 """
 
-import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from bac_calculator import BACCalculator
 from real_time_monitor import RealTimeBACMonitor
-from visualization import BACVisualizer
+from visualization import BACVisualizer, downsample_lttb
 
 def test_bac_calculator():
     """Test the BAC calculator functionality"""
@@ -33,6 +32,13 @@ def test_bac_calculator():
     sober_time = calculator.calculate_sober_time(bac)
     print(f"   Time to sober: {sober_time:.1f} hours")
     
+    # Test batch BAC curve matches the single-point calculation
+    hours = [0.0, 0.25, 0.5, 1.0, 4.0, 12.0]
+    curve = calculator.calculate_bac_curve(150, 'male', drinks, hours)
+    for t, curve_bac in zip(hours, curve):
+        assert abs(curve_bac - calculator.calculate_bac_widmark(150, 'male', drinks, t)) < 1e-12
+    print(f"   BAC curve over {len(hours)} points matches")
+    
     print("✅ BAC Calculator tests passed!\n")
 
 def test_real_time_monitor():
@@ -50,9 +56,6 @@ def test_real_time_monitor():
     monitor.add_drink('beer')
     monitor.add_drink('wine')
     
-    # Wait a moment for processing
-    time.sleep(1)
-    
     status = monitor.get_current_status()
     print(f"   BAC after drinks: {status['bac']:.3f}")
     print(f"   Drinks consumed: {status['drinks_count']}")
@@ -63,6 +66,18 @@ def test_real_time_monitor():
     print(f"   Skin Conductance: {sensors['skin_conductance']:.1f} μS")
     print(f"   Temperature: {sensors['temperature']:.1f}°F")
     
+    # Status is an immutable snapshot, also readable by attribute
+    assert status.drinks_count == 2 and status.level == status['effects']['level']
+    
+    # While monitoring, the snapshot is reused until the next update;
+    # once stopped, each call brings it up to date
+    monitor.start_monitoring()
+    monitor.wait_for_sample(timeout=1)
+    status = monitor.get_current_status()
+    assert monitor.get_current_status() is status
+    monitor.stop_monitoring()
+    assert monitor.get_current_status() is not status
+    
     print("✅ Real-time Monitor tests passed!\n")
 
 def test_visualization():
@@ -86,6 +101,23 @@ def test_visualization():
     wearable_fig = visualizer.create_wearable_display(status)
     print("   Wearable display created successfully")
     
+    wearable_html = visualizer.create_wearable_html(status)
+    assert '0.075' in wearable_html and 'Moderate Impairment' in wearable_html
+    print("   Wearable HTML created successfully")
+    
+    # Test projected BAC curve
+    drinks = [{'volume_oz': 12.0, 'alcohol_percent': 5.0}]
+    projection_fig = visualizer.create_bac_projection(BACCalculator(), 150, 'female', drinks)
+    print("   BAC projection created successfully")
+    
+    # Test history downsampling
+    start = datetime.now()
+    history = [{'timestamp': start + timedelta(seconds=5 * i), 'bac': (i % 100) / 1000} for i in range(5000)]
+    downsampled = downsample_lttb(history, threshold=500)
+    assert len(downsampled) == 500
+    assert downsampled[0] is history[0] and downsampled[-1] is history[-1]
+    print(f"   Downsampled {len(history)} points to {len(downsampled)}")
+    
     print("✅ Visualization tests passed!\n")
 
 def test_integration():
@@ -98,13 +130,13 @@ def test_integration():
     
     # Start monitoring
     monitor.start_monitoring()
-    time.sleep(1)
+    assert monitor.wait_for_sample(timeout=1)
     
     # Add drinks
     monitor.add_drink('beer')
-    time.sleep(2)
+    assert monitor.wait_for_sample(timeout=1)
     monitor.add_drink('liquor')
-    time.sleep(2)
+    assert monitor.wait_for_sample(timeout=1)
     
     # Get status and create visualizations
     status = monitor.get_current_status()
@@ -119,9 +151,24 @@ def test_integration():
     
     print("   All visualizations created successfully")
     
+    # Fast-forward an hour of simulated time
+    monitor.advance_simulated_time(60)
+    recent_data = monitor.get_recent_data(minutes=60)
+    assert len(recent_data) >= 60 * 60 // 5
+    assert all(a['timestamp'] < b['timestamp'] for a, b in zip(recent_data, recent_data[1:]))
+    print(f"   BAC after 1 simulated hour: {monitor.current_bac:.3f} ({len(recent_data)} samples)")
+    
     # Stop monitoring
     monitor.stop_monitoring()
     
+    # Array history matches the data points, and charts without a DataFrame
+    recent_data = monitor.get_recent_data(minutes=60)
+    recent_arrays = monitor.get_recent_arrays(minutes=60)
+    assert recent_arrays['bac'].tolist() == [point['bac'] for point in recent_data]
+    assert recent_arrays['timestamp'].tolist() == [point['timestamp'] for point in recent_data]
+    assert visualizer.create_real_time_chart(recent_arrays, max_points=500) is not None
+    assert visualizer.create_interactive_dashboard(recent_data, max_points=500) is not None
+    
     print("✅ Integration tests passed!\n")
 
 def main():
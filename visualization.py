@@ -3,16 +3,95 @@ BAC Visualization Module
 Real-time charts and graphs for BAC monitoring on wearable devices
 """
 
+import html
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 from matplotlib.patches import Circle
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
-import streamlit as st
+from bac_calculator import _bac_level_index
+
+def _lttb_indices(x, y, threshold):
+    """
+    Indices of the `threshold` points of (x, y) that the Largest-Triangle-
+    Three-Buckets algorithm keeps (first and last points are always kept)
+    """
+    n = len(x)
+    
+    # Every bucket but the first and last point gets one representative
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        
+        # Pick the point in this bucket forming the largest triangle with
+        # the previously selected point and the next bucket's average
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected.append(a)
+    selected.append(n - 1)
+    
+    return selected
+
+def downsample_lttb(data_history, threshold=2000, key='bac'):
+    """
+    Reduce a list of data points to at most `threshold` points with the
+    Largest-Triangle-Three-Buckets algorithm, keeping the visual shape of
+    the `key` series over time (first and last points are always kept)
+    """
+    n = len(data_history)
+    if threshold >= n or threshold < 3:
+        return data_history
+    
+    x = np.fromiter((point['timestamp'].timestamp() for point in data_history), dtype=np.float64, count=n)
+    y = np.fromiter((point[key] for point in data_history), dtype=np.float64, count=n)
+    
+    return [data_history[i] for i in _lttb_indices(x, y, threshold)]
+
+def downsample_arrays(history, threshold=2000, key='bac'):
+    """
+    downsample_lttb for history given as a dict of equal-length arrays
+    (see RealTimeBACMonitor.get_recent_arrays)
+    """
+    n = len(history[key])
+    if threshold >= n or threshold < 3:
+        return history
+    
+    # Only relative distances matter, so milliseconds work as well as seconds
+    x = history['timestamp'].astype('datetime64[ms]').astype(np.float64)
+    idx = _lttb_indices(x, history[key].astype(np.float64), threshold)
+    return {name: values[idx] for name, values in history.items()}
+
+def _history_columns(data_history, max_points):
+    """
+    History as a dict of arrays with datetime64 timestamps, downsampled to
+    max_points; accepts a list of data points or a dict of arrays
+    Returns None if there is no data
+    """
+    if isinstance(data_history, dict):
+        if not len(data_history['bac']):
+            return None
+        return downsample_arrays(data_history, max_points)
+    
+    if not data_history:
+        return None
+    
+    # Transpose the points into columns in one pass, then one array per column
+    points = downsample_lttb(data_history, max_points)
+    names = list(points[0])
+    values = zip(*([point[name] for name in names] for point in points))
+    return {
+        name: np.array(column, dtype='datetime64[ms]' if name == 'timestamp' else np.float64)
+        for name, column in zip(names, values)
+    }
 
 class BACVisualizer:
     """Visualization tools for BAC monitoring"""
@@ -25,13 +104,87 @@ class BACVisualizer:
             'high': '#FF0000',       # Red
             'severe': '#8B0000'      # Dark Red
         }
+        
+        # Colors for each BAC level, indexed like the level effects
+        self._band_colors = tuple(self.colors[name] for name in ('sober', 'mild', 'moderate', 'high', 'severe'))
+        
+        # Plotly gauge for the web interface, built once; each call only sets the value
+        bands = [(0, 0.02, 'sober'), (0.02, 0.05, 'mild'), (0.05, 0.08, 'moderate'),
+                 (0.08, 0.15, 'high'), (0.15, 0.3, 'severe')]
+        self._plotly_gauge = go.Figure(go.Indicator(
+            mode='gauge+number',
+            value=0.0,
+            number={'valueformat': '.3f'},
+            title={'text': 'BAC'},
+            gauge={
+                'axis': {'range': [0, 0.3], 'tickvals': [0, 0.02, 0.05, 0.08, 0.15, 0.3]},
+                'bar': {'color': self.colors['sober']},
+                'steps': [{'range': [low, high], 'color': self._translucent(self.colors[name])}
+                          for low, high, name in bands],
+                'threshold': {'line': {'color': 'red', 'width': 3}, 'value': 0.08}
+            }
+        ))
+        self._plotly_gauge.update_layout(margin=dict(l=30, r=30, t=50, b=10), height=300)
+        
+        # Matplotlib gauge scale markers (x, y, label), on the same 1000 degrees per BAC scale as the arc
+        levels = np.array([0, 0.02, 0.05, 0.08, 0.15])
+        angles = np.radians(180 - levels * 1000)
+        self._gauge_markers = tuple(zip((0.5 + 0.35 * np.cos(angles)).tolist(),
+                                        (0.5 + 0.35 * np.sin(angles)).tolist(),
+                                        [f'{level:.2f}' for level in levels]))
+        
+        # Matplotlib figures reused between calls (one per chart kind), and the
+        # real-time chart's lines so a refresh only swaps their data
+        self._figures = {}
+        self._chart_artists = None
+        self._gauge_drawn = None  # (figure, axes, (rounded BAC, figsize)) of the last gauge drawn
+    
+    @staticmethod
+    def _translucent(hex_color, alpha=0.25):
+        """CSS rgba() for a '#RRGGBB' color at the given opacity"""
+        r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+        return f'rgba({r}, {g}, {b}, {alpha})'
+    
+    def _bac_color(self, bac_level):
+        """Display color for a BAC level"""
+        return self._band_colors[_bac_level_index(bac_level)]
+    
+    def _subplots(self, kind, fig, figsize, nrows=1, **kwargs):
+        """
+        Figure and axes for a chart: `fig` (or this visualizer's figure for
+        that kind of chart) cleared and resized so one figure is redrawn
+        instead of allocating another; a new figure if there is none yet or
+        it has been closed
+        """
+        if fig is None:
+            fig = self._figures.get(kind)
+            if fig is None or not plt.fignum_exists(fig.number):
+                fig, axes = plt.subplots(nrows, 1, figsize=figsize, **kwargs)
+                self._figures[kind] = fig
+                return fig, axes
+        fig.clear()
+        fig.set_size_inches(figsize)
+        fig.patch.set_facecolor(plt.rcParams['figure.facecolor'])
+        return fig, fig.subplots(nrows, 1, **kwargs)
     
-    def create_bac_gauge(self, bac_level, figsize=(8, 6)):
+    def create_bac_gauge(self, bac_level, figsize=(8, 6), fig=None):
         """
         Create a circular gauge showing current BAC level
         Suitable for wearable device displays
+        The figure is reused between calls; pass fig to draw into another one
+        The gauge shows BAC to 0.001, so a repeat call at the same rounded
+        level returns the already drawn figure
         """
-        fig, ax = plt.subplots(figsize=figsize)
+        bac_level = round(bac_level, 3)
+        key = (bac_level, tuple(figsize))
+        
+        if fig is None and self._gauge_drawn is not None:
+            drawn_fig, drawn_ax, drawn_key = self._gauge_drawn
+            if drawn_key == key and plt.fignum_exists(drawn_fig.number) and drawn_ax in drawn_fig.axes:
+                return drawn_fig
+        
+        cached = fig is None
+        fig, ax = self._subplots('gauge', fig, figsize)
         
         # Define gauge parameters
         center = (0.5, 0.5)
@@ -42,16 +195,7 @@ class BACVisualizer:
         ax.add_patch(gauge)
         
         # Determine color based on BAC level
-        if bac_level < 0.02:
-            color = self.colors['sober']
-        elif bac_level < 0.05:
-            color = self.colors['mild']
-        elif bac_level < 0.08:
-            color = self.colors['moderate']
-        elif bac_level < 0.15:
-            color = self.colors['high']
-        else:
-            color = self.colors['severe']
+        color = self._bac_color(bac_level)
         
         # Create BAC arc
         angle = min(bac_level * 1000, 180)  # Scale BAC to 0-180 degrees
@@ -65,36 +209,62 @@ class BACVisualizer:
         ax.text(0.5, 0.3, 'BAC', fontsize=16, ha='center', va='center')
         
         # Add scale markers
-        for i, level in enumerate([0, 0.02, 0.05, 0.08, 0.15]):
-            angle = 180 - (level * 1000)
-            x = 0.5 + 0.35 * np.cos(np.radians(angle))
-            y = 0.5 + 0.35 * np.sin(np.radians(angle))
-            ax.text(x, y, f'{level:.2f}', fontsize=10, ha='center', va='center')
+        for x, y, label in self._gauge_markers:
+            ax.text(x, y, label, fontsize=10, ha='center', va='center')
         
         ax.set_xlim(0, 1)
         ax.set_ylim(0, 1)
         ax.set_aspect('equal')
         ax.axis('off')
         
-        plt.tight_layout()
+        fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
+        if cached:
+            self._gauge_drawn = (fig, ax, key)
         return fig
     
-    def create_real_time_chart(self, data_history, figsize=(10, 6)):
+    def create_plotly_gauge(self, bac_level):
+        """
+        Create a Plotly gauge of the current BAC level, rendered in the browser
+        (for the web interface; the matplotlib gauge is for saved images)
+        The figure is reused between calls, so render it before the next call
+        """
+        self._plotly_gauge.update_traces(value=bac_level, gauge_bar_color=self._bac_color(bac_level))
+        return self._plotly_gauge
+    
+    def create_real_time_chart(self, data_history, figsize=(10, 6), fig=None, max_points=2000):
         """
         Create real-time BAC chart with sensor data
+        data_history is a list of data points or a dict of arrays (see
+        RealTimeBACMonitor.get_recent_arrays); longer histories are
+        downsampled to max_points (see downsample_lttb)
+        The figure is reused between calls; pass fig to draw into another one
         """
-        if not data_history:
+        data = _history_columns(data_history, max_points)
+        if data is None:
             return None
         
-        # Convert to DataFrame
-        df = pd.DataFrame(data_history)
-        df['time'] = pd.to_datetime(df['timestamp'])
+        times = data['timestamp']
+        columns = ('bac', 'heart_rate', 'skin_conductance')
+        
+        # Chart already drawn: only update the lines' data and rescale
+        if fig is None and self._chart_artists is not None:
+            fig, lines, axes = self._chart_artists
+            if plt.fignum_exists(fig.number) and axes[0] in fig.axes:
+                for line, column in zip(lines, columns):
+                    line.set_data(times, data[column])
+                for ax in axes:
+                    ax.relim()
+                    ax.autoscale_view()
+                fig.set_size_inches(figsize)
+                return fig
+            fig = None
         
         # Create subplots
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize, sharex=True)
+        cached = fig is None
+        fig, (ax1, ax2) = self._subplots('chart', fig, figsize, 2, sharex=True)
         
         # BAC chart
-        ax1.plot(df['time'], df['bac'], 'b-', linewidth=2, label='BAC')
+        bac_line, = ax1.plot(times, data['bac'], 'b-', linewidth=2, label='BAC')
         ax1.axhline(y=0.08, color='r', linestyle='--', alpha=0.7, label='Legal Limit')
         ax1.axhline(y=0.05, color='orange', linestyle='--', alpha=0.7, label='Warning Level')
         ax1.set_ylabel('BAC Level')
@@ -103,29 +273,55 @@ class BACVisualizer:
         ax1.grid(True, alpha=0.3)
         
         # Sensor data
-        ax2.plot(df['time'], df['heart_rate'], 'r-', label='Heart Rate (BPM)')
+        hr_line, = ax2.plot(times, data['heart_rate'], 'r-', label='Heart Rate (BPM)')
         ax2_twin = ax2.twinx()
-        ax2_twin.plot(df['time'], df['skin_conductance'], 'g-', label='Skin Conductance')
+        sc_line, = ax2_twin.plot(times, data['skin_conductance'], 'g-', label='Skin Conductance')
         ax2.set_xlabel('Time')
         ax2.set_ylabel('Heart Rate (BPM)', color='r')
         ax2_twin.set_ylabel('Skin Conductance', color='g')
-        ax2.legend(loc='upper left')
-        ax2_twin.legend(loc='upper right')
+        ax2.legend(handles=[hr_line, sc_line], loc='upper left')
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.subplots_adjust(left=0.08, right=0.92, top=0.93, bottom=0.1, hspace=0.1)
+        if cached:
+            self._chart_artists = (fig, (bac_line, hr_line, sc_line), (ax1, ax2, ax2_twin))
         return fig
-    
-    def create_interactive_dashboard(self, data_history):
+
+    def create_bac_projection(self, bac_calculator, weight_lbs, gender, drinks, hours=8.0, figsize=(10, 4), fig=None):
+        """
+        Create a chart of the projected Widmark BAC curve for a set of drinks,
+        from the first drink until `hours` later (one point per minute)
+        The figure is reused between calls; pass fig to draw into another one
+        """
+        if not drinks:
+            return None
+
+        t = np.linspace(0, hours, int(hours * 60) + 1)
+        bac = bac_calculator.calculate_bac_curve(weight_lbs, gender, drinks, t)
+
+        fig, ax = self._subplots('projection', fig, figsize)
+        ax.plot(t, bac, 'b-', linewidth=2, label='Projected BAC')
+        ax.axhline(y=0.08, color='r', linestyle='--', alpha=0.7, label='Legal Limit')
+        ax.axhline(y=0.05, color='orange', linestyle='--', alpha=0.7, label='Warning Level')
+        ax.set_xlabel('Hours Since First Drink')
+        ax.set_ylabel('BAC Level')
+        ax.set_title('Projected BAC')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+        fig.subplots_adjust(left=0.09, right=0.97, top=0.9, bottom=0.14)
+        return fig
+
+    def create_interactive_dashboard(self, data_history, max_points=2000):
         """
         Create an interactive Plotly dashboard
+        data_history is a list of data points or a dict of arrays, as for
+        create_real_time_chart
         """
-        if not data_history:
+        data = _history_columns(data_history, max_points)
+        if data is None:
             return None
         
-        df = pd.DataFrame(data_history)
-        df['time'] = pd.to_datetime(df['timestamp'])
-        
         # Create subplots
         fig = make_subplots(
             rows=3, cols=1,
@@ -135,8 +331,8 @@ class BACVisualizer:
         
         # BAC trace
         fig.add_trace(
-            go.Scatter(x=df['time'], y=df['bac'], mode='lines', name='BAC',
-                      line=dict(color='blue', width=2)),
+            go.Scattergl(x=data['timestamp'], y=data['bac'], mode='lines', name='BAC',
+                        line=dict(color='blue', width=2)),
             row=1, col=1
         )
         
@@ -148,26 +344,27 @@ class BACVisualizer:
         
         # Heart rate trace
         fig.add_trace(
-            go.Scatter(x=df['time'], y=df['heart_rate'], mode='lines', name='Heart Rate',
-                      line=dict(color='red', width=2)),
+            go.Scattergl(x=data['timestamp'], y=data['heart_rate'], mode='lines', name='Heart Rate',
+                        line=dict(color='red', width=2)),
             row=2, col=1
         )
         
         # Skin conductance trace
         fig.add_trace(
-            go.Scatter(x=df['time'], y=df['skin_conductance'], mode='lines', name='Skin Conductance',
-                      line=dict(color='green', width=2)),
+            go.Scattergl(x=data['timestamp'], y=data['skin_conductance'], mode='lines', name='Skin Conductance',
+                        line=dict(color='green', width=2)),
             row=3, col=1
         )
         
         fig.update_layout(height=800, title_text="Real-time BAC Monitoring Dashboard")
         return fig
     
-    def create_wearable_display(self, current_status, figsize=(4, 6)):
+    def create_wearable_display(self, current_status, figsize=(4, 6), fig=None):
         """
         Create a compact display suitable for wearable devices
+        The figure is reused between calls; pass fig to draw into another one
         """
-        fig, ax = plt.subplots(figsize=figsize)
+        fig, ax = self._subplots('wearable', fig, figsize)
         
         # Background
         ax.set_facecolor('black')
@@ -177,16 +374,7 @@ class BACVisualizer:
         bac = current_status['bac']
         effects = current_status['effects']
         
-        if bac < 0.02:
-            color = self.colors['sober']
-        elif bac < 0.05:
-            color = self.colors['mild']
-        elif bac < 0.08:
-            color = self.colors['moderate']
-        elif bac < 0.15:
-            color = self.colors['high']
-        else:
-            color = self.colors['severe']
+        color = self._bac_color(bac)
         
         # Main BAC display
         ax.text(0.5, 0.8, f'{bac:.3f}', fontsize=36, ha='center', va='center', 
@@ -212,13 +400,40 @@ class BACVisualizer:
         ax.set_ylim(0, 1)
         ax.axis('off')
         
-        plt.tight_layout()
+        fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
         return fig
     
+    def create_wearable_html(self, current_status):
+        """
+        Create the wearable display as an HTML block, for web pages
+        (st.markdown(..., unsafe_allow_html=True)) where a rendered
+        image isn't needed; same layout as create_wearable_display
+        """
+        bac = current_status['bac']
+        color = self._bac_color(bac)
+        sober_time = current_status['sober_time_hours']
+        sober = f'<div style="font-size:12pt">Sober in: {sober_time:.1f}h</div>' if sober_time > 0 else ''
+        
+        return (
+            f'<div style="background:black;color:white;text-align:center;padding:1.5em 1em;'
+            f'border-radius:1em;font-family:sans-serif">'
+            f'<div style="font-size:36pt;font-weight:bold;color:{color}">{bac:.3f}</div>'
+            f'<div style="font-size:16pt">BAC</div>'
+            f'<div style="font-size:14pt;font-weight:bold;color:{color};margin:1em 0">'
+            f'{html.escape(current_status["effects"]["level"])}</div>'
+            f'{sober}'
+            f'<div style="font-size:10pt;color:lightgray;margin-top:1em">'
+            f'HR: {current_status["sensors"]["heart_rate"]:.0f}</div>'
+            f'</div>'
+        )
+    
     def create_streamlit_app(self, monitor):
         """
         Create a Streamlit web interface for the BAC monitor
         """
+        # Only needed here, so other callers don't pay for importing Streamlit
+        import streamlit as st
+        
         st.set_page_config(page_title="BAC Monitor", layout="wide")
         
         st.title("🍺 Real-time BAC Monitor")
@@ -250,8 +465,8 @@ class BACVisualizer:
         
         with col1:
             st.subheader("Real-time BAC Chart")
-            recent_data = monitor.get_recent_data(minutes=30)
-            if recent_data:
+            recent_data = monitor.get_recent_arrays(minutes=30)
+            if len(recent_data['bac']):
                 chart_fig = self.create_real_time_chart(recent_data)
                 if chart_fig:
                     st.pyplot(chart_fig)
@@ -263,8 +478,8 @@ class BACVisualizer:
             status = monitor.get_current_status()
             
             # BAC gauge
-            gauge_fig = self.create_bac_gauge(status['bac'], figsize=(6, 4))
-            st.pyplot(gauge_fig)
+            gauge_fig = self.create_plotly_gauge(status['bac'])
+            st.plotly_chart(gauge_fig, use_container_width=True)
             
             # Status info
             st.metric("BAC Level", f"{status['bac']:.3f}")
@@ -288,5 +503,9 @@ class BACVisualizer:
         if monitor.drinks:
             st.subheader("Drink History")
             drink_df = pd.DataFrame(monitor.drinks)
-            drink_df['time'] = pd.to_datetime(drink_df['timestamp']).dt.strftime('%H:%M:%S')
-            st.dataframe(drink_df[['time', 'alcohol_percent', 'volume_oz']]) 
\ No newline at end of file
+            st.dataframe(
+                drink_df,
+                hide_index=True,
+                column_order=['timestamp', 'alcohol_percent', 'volume_oz'],
+                column_config={'timestamp': st.column_config.DatetimeColumn('time', format='HH:mm:ss')}
+            ) 
\ No newline at end of file
@@ -3,16 +3,18 @@ Streamlit Web Application for BAC Monitoring
 Modern web interface for real-time BAC tracking
 """
 
+import matplotlib
+matplotlib.use('Agg')  # headless server: render figures off-screen
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
 import time
-import threading
-from real_time_monitor import RealTimeBACMonitor
-from visualization import BACVisualizer
+from real_time_monitor import RealTimeBACMonitor, configure_logging
+from visualization import BACVisualizer, downsample_arrays
+
+# Alerts and monitoring loop errors go to the server console
+configure_logging()
 
 # Page configuration
 st.set_page_config(
@@ -23,7 +25,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -58,7 +60,19 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Streamlit resends every element on each rerun (once a second while
+# monitoring), so send the styles with their whitespace collapsed
+st.markdown(" ".join(CUSTOM_CSS.split()), unsafe_allow_html=True)
+
+# Default (volume oz, alcohol %) for each drink type
+DRINK_DEFAULTS = {
+    "beer": (12.0, 5.0),
+    "wine": (5.0, 12.0),
+    "liquor": (1.5, 40.0),
+    "cocktail": (8.0, 15.0)
+}
 
 # Initialize session state
 if 'monitor' not in st.session_state:
@@ -105,6 +119,73 @@ def add_drink():
         st.session_state.monitor.add_drink(drink_type, volume, alcohol_percent)
         st.success(f"Added {drink_type}!")
 
+def create_monitoring_chart():
+    """
+    Create the real-time BAC and sensor chart with empty traces
+    Kept in the session state and refilled with the latest data on each rerun
+    """
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('BAC Level', 'Sensor Data'),
+        vertical_spacing=0.1,
+        row_heights=[0.7, 0.3],
+        specs=[[{}], [{'secondary_y': True}]]
+    )
+    
+    # BAC trace
+    fig.add_trace(
+        go.Scattergl(
+            x=[],
+            y=[],
+            mode='lines', 
+            name='BAC',
+            line=dict(color='blue', width=3)
+        ),
+        row=1, col=1
+    )
+    
+    # Add threshold lines
+    fig.add_hline(y=0.08, line_dash="dash", line_color="red", 
+                 annotation_text="Legal Limit (0.08)", row=1, col=1)
+    fig.add_hline(y=0.05, line_dash="dash", line_color="orange", 
+                 annotation_text="Warning (0.05)", row=1, col=1)
+    
+    # Sensor data
+    fig.add_trace(
+        go.Scattergl(
+            x=[],
+            y=[],
+            mode='lines', 
+            name='Heart Rate',
+            line=dict(color='red', width=2)
+        ),
+        row=2, col=1
+    )
+    
+    fig.add_trace(
+        go.Scattergl(
+            x=[],
+            y=[],
+            mode='lines', 
+            name='Skin Conductance',
+            line=dict(color='green', width=2)
+        ),
+        row=2, col=1, secondary_y=True
+    )
+    
+    fig.update_layout(
+        height=500,
+        showlegend=True,
+        title_text="Real-time BAC and Sensor Monitoring"
+    )
+    
+    # Update y-axes
+    fig.update_yaxes(title_text="BAC Level", row=1, col=1)
+    fig.update_yaxes(title_text="Heart Rate (BPM)", row=2, col=1)
+    fig.update_yaxes(title_text="Skin Conductance (μS)", row=2, col=1, secondary_y=True)
+    
+    return fig
+
 # Main header
 st.markdown('<h1 class="main-header">🍺 Real-time BAC Monitor</h1>', unsafe_allow_html=True)
 
@@ -152,14 +233,7 @@ with st.sidebar:
     )
     
     # Default values based on drink type
-    defaults = {
-        "beer": (12.0, 5.0),
-        "wine": (5.0, 12.0),
-        "liquor": (1.5, 40.0),
-        "cocktail": (8.0, 15.0)
-    }
-    
-    default_volume, default_alcohol = defaults[drink_type]
+    default_volume, default_alcohol = DRINK_DEFAULTS[drink_type]
     
     volume = st.number_input(
         "Volume (oz)",
@@ -228,8 +302,8 @@ if st.session_state.monitor:
     
     # BAC Gauge
     st.subheader("📊 BAC Gauge")
-    gauge_fig = st.session_state.visualizer.create_bac_gauge(status['bac'], figsize=(8, 6))
-    st.pyplot(gauge_fig)
+    gauge_fig = st.session_state.visualizer.create_plotly_gauge(status['bac'])
+    st.plotly_chart(gauge_fig, use_container_width=True)
     
     # Main content columns
     col1, col2 = st.columns([2, 1])
@@ -237,73 +311,20 @@ if st.session_state.monitor:
     with col1:
         st.subheader("📈 Real-time Monitoring")
         
-        # Get recent data
-        recent_data = st.session_state.monitor.get_recent_data(minutes=30)
+        # Get recent data, capped at 500 points for the browser
+        recent_data = downsample_arrays(st.session_state.monitor.get_recent_arrays(minutes=30), 500)
         
-        if recent_data and len(recent_data) > 1:
-            # Create interactive chart
-            df = pd.DataFrame(recent_data)
-            df['time'] = pd.to_datetime(df['timestamp'])
-            
-            fig = make_subplots(
-                rows=2, cols=1,
-                subplot_titles=('BAC Level', 'Sensor Data'),
-                vertical_spacing=0.1,
-                row_heights=[0.7, 0.3]
-            )
-            
-            # BAC trace
-            fig.add_trace(
-                go.Scatter(
-                    x=df['time'], 
-                    y=df['bac'], 
-                    mode='lines', 
-                    name='BAC',
-                    line=dict(color='blue', width=3)
-                ),
-                row=1, col=1
-            )
+        if len(recent_data['bac']) > 1:
+            # Chart layout is built once per session; each rerun only swaps the trace data
+            if st.session_state.get('chart_fig') is None:
+                st.session_state.chart_fig = create_monitoring_chart()
+            fig = st.session_state.chart_fig
             
-            # Add threshold lines
-            fig.add_hline(y=0.08, line_dash="dash", line_color="red", 
-                         annotation_text="Legal Limit (0.08)", row=1, col=1)
-            fig.add_hline(y=0.05, line_dash="dash", line_color="orange", 
-                         annotation_text="Warning (0.05)", row=1, col=1)
-            
-            # Sensor data
-            fig.add_trace(
-                go.Scatter(
-                    x=df['time'], 
-                    y=df['heart_rate'], 
-                    mode='lines', 
-                    name='Heart Rate',
-                    line=dict(color='red', width=2)
-                ),
-                row=2, col=1
-            )
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=df['time'], 
-                    y=df['skin_conductance'], 
-                    mode='lines', 
-                    name='Skin Conductance',
-                    line=dict(color='green', width=2),
-                    yaxis='y3'
-                ),
-                row=2, col=1
-            )
-            
-            fig.update_layout(
-                height=500,
-                showlegend=True,
-                title_text="Real-time BAC and Sensor Monitoring"
-            )
-            
-            # Update y-axes
-            fig.update_yaxes(title_text="BAC Level", row=1, col=1)
-            fig.update_yaxes(title_text="Heart Rate (BPM)", row=2, col=1)
-            fig.update_yaxes(title_text="Skin Conductance (μS)", row=2, col=1, secondary_y=True)
+            times = recent_data['timestamp']
+            with fig.batch_update():
+                for trace, column in zip(fig.data, ('bac', 'heart_rate', 'skin_conductance')):
+                    trace.x = times
+                    trace.y = recent_data[column]
             
             st.plotly_chart(fig, use_container_width=True)
         else:
@@ -326,6 +347,10 @@ if st.session_state.monitor:
         st.metric("Temperature", f"{sensors['temperature']:.1f}°F")
         st.markdown('</div>', unsafe_allow_html=True)
         
+        # Watch face preview
+        st.subheader("⌚ Wearable View")
+        st.markdown(st.session_state.visualizer.create_wearable_html(status), unsafe_allow_html=True)
+        
         # Monitoring status
         st.subheader("🔍 Monitoring Status")
         if st.session_state.monitoring:
@@ -357,18 +382,24 @@ if st.session_state.monitor:
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Drink history
-    if st.session_state.monitor.drinks:
+    drinks = st.session_state.monitor.drinks
+    if drinks:
         st.subheader("🍺 Drink History")
         
-        drink_df = pd.DataFrame(st.session_state.monitor.drinks)
-        drink_df['time'] = pd.to_datetime(drink_df['timestamp']).dt.strftime('%H:%M:%S')
-        drink_df['date'] = pd.to_datetime(drink_df['timestamp']).dt.strftime('%Y-%m-%d')
-        
-        # Display drink history
-        display_df = drink_df[['date', 'time', 'alcohol_percent', 'volume_oz']].copy()
-        display_df.columns = ['Date', 'Time', 'Alcohol %', 'Volume (oz)']
+        drink_df = pd.DataFrame(drinks)
         
-        st.dataframe(display_df, use_container_width=True)
+        # Display drink history (formatted by the browser, not per row here)
+        st.dataframe(
+            drink_df,
+            use_container_width=True,
+            hide_index=True,
+            column_order=['timestamp', 'alcohol_percent', 'volume_oz'],
+            column_config={
+                'timestamp': st.column_config.DatetimeColumn('Time', format='YYYY-MM-DD HH:mm:ss'),
+                'alcohol_percent': st.column_config.NumberColumn('Alcohol %', format='%.1f%%'),
+                'volume_oz': st.column_config.NumberColumn('Volume (oz)', format='%.1f')
+            }
+        )
         
         # Drink statistics
         col1, col2, col3 = st.columns(3)